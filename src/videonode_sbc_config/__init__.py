@@ -1,2 +1,5 @@
+__version__ = "0.1.0"
+
+
 def hello() -> str:
     return "Hello from videonode-sbc-config!"
@@ -0,0 +1,40 @@
+"""Hardware encoder benchmark."""
+
+import sys
+
+from .baseline import (
+    DEFAULT_THRESHOLD,
+    compare_results,
+    get_fingerprint,
+    get_stack_versions,
+    load_baseline,
+    save_run,
+)
+from .matrix import BITRATES, ENCODERS, RESOLUTIONS, STREAM_COUNTS, build_matrix
+from .runner import run_benchmark, run_config
+from .types import BenchComparison, BenchConfig, BenchResult
+
+__all__ = [
+    "BITRATES",
+    "DEFAULT_THRESHOLD",
+    "ENCODERS",
+    "RESOLUTIONS",
+    "STREAM_COUNTS",
+    "BenchComparison",
+    "BenchConfig",
+    "BenchResult",
+    "build_matrix",
+    "compare_results",
+    "get_fingerprint",
+    "get_stack_versions",
+    "load_baseline",
+    "run_benchmark",
+    "run_config",
+    "save_run",
+    "stub_ffmpeg",
+]
+
+
+def stub_ffmpeg() -> list[str]:
+    """Command that runs the stub ffmpeg (see stub.py)."""
+    return [sys.executable, "-m", "videonode_sbc_config.bench.stub"]
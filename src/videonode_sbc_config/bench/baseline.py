@@ -0,0 +1,157 @@
+"""Per-board benchmark baselines and regression comparison.
+
+Every saved run is one JSON line in the store, tagged with a fingerprint
+of the platform and the stack versions it ran on. Comparison looks up the
+latest run on the same board (same model, board and OS) with a different
+fingerprint, so a rebuilt stack is measured against the stack before it
+even after its own runs were saved; runs of the same stack are only used
+when no other stack was benchmarked yet.
+
+The stack versions include the FFmpeg build profile, read from the stamp
+the deploy writes when it installs FFmpeg ("unknown" without one).
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from videonode_sbc_config.deploys.hardware.rockchip.versions import (
+    FFMPEG_VERSION,
+    MPP_VERSION,
+    RGA_BRANCH,
+)
+from videonode_sbc_config.platform import Platform
+
+from .types import BenchComparison, BenchConfig, BenchResult
+
+STORE_DIR = "videonode-sbc-config"
+STORE_FILE = "bench.jsonl"
+DEFAULT_THRESHOLD = 0.1  # Flag fps drops larger than 10%
+# Written by deploys/build.py (get_stamp_path("ffmpeg"))
+FFMPEG_STAMP = "/var/lib/videonode-sbc-config/stamps/ffmpeg.stamp"
+
+# Platform fields that identify a board; kernel and OS version may change
+BOARD_FIELDS = ("sbc_model", "board", "os_type")
+
+
+def get_store_path() -> Path:
+    """Get the baseline store path under $XDG_DATA_HOME."""
+    data_home = os.environ.get("XDG_DATA_HOME") or Path.home() / ".local/share"
+    return Path(data_home) / STORE_DIR / STORE_FILE
+
+
+def get_ffmpeg_profile(stamp: str = FFMPEG_STAMP) -> str:
+    """Get the build profile of the installed FFmpeg from its stamp."""
+    try:
+        lines = Path(stamp).read_text().splitlines()
+    except OSError:
+        return "unknown"
+    profiles = [line.partition("=")[2] for line in lines if line.startswith("profile=")]
+    return profiles[0] if profiles else "unknown"
+
+
+def get_stack_versions() -> dict[str, str]:
+    return {
+        "ffmpeg": FFMPEG_VERSION,
+        "ffmpeg_profile": get_ffmpeg_profile(),
+        "mpp": MPP_VERSION,
+        "rga": RGA_BRANCH,
+    }
+
+
+def get_fingerprint(platform: Platform, versions: dict[str, str]) -> str:
+    """Hash of platform fields and stack versions."""
+    content = json.dumps(
+        {"platform": platform.to_dict(), "versions": versions}, sort_keys=True
+    )
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def save_run(
+    platform: Platform,
+    results: list[BenchResult],
+    frames: int,
+    path: Path | None = None,
+) -> None:
+    """Append a benchmark run (failed configurations excluded) to the store."""
+    path = path or get_store_path()
+    versions = get_stack_versions()
+    record = {
+        "timestamp": time.time(),
+        "fingerprint": get_fingerprint(platform, versions),
+        "platform": platform.to_dict(),
+        "versions": versions,
+        "frames": frames,
+        "results": [r.to_dict() for r in results if not r.error],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def load_baseline(
+    platform: Platform,
+    frames: int,
+    path: Path | None = None,
+    fingerprint: str | None = None,
+) -> dict | None:
+    """Get the latest stored run on this board with the same frame count.
+
+    Runs with another fingerprint than the given one (the current stack)
+    are preferred over the latest run of the current stack.
+    """
+    path = path or get_store_path()
+    try:
+        lines = path.read_text().splitlines()
+    except OSError:
+        return None
+
+    board = {k: platform.to_dict()[k] for k in BOARD_FIELDS}
+    same_stack = None
+    for line in reversed(lines):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if record.get("frames") != frames:
+            continue
+        if not all(record["platform"].get(k) == v for k, v in board.items()):
+            continue
+        if fingerprint is None or record.get("fingerprint") != fingerprint:
+            return record
+        same_stack = same_stack or record
+    return same_stack
+
+
+def _config_key(config: BenchConfig | dict) -> tuple:
+    if isinstance(config, dict):
+        return (
+            config["encoder"],
+            config["resolution"],
+            config["bitrate"],
+            config["streams"],
+        )
+    return (config.encoder, config.resolution, config.bitrate, config.streams)
+
+
+def compare_results(
+    results: list[BenchResult],
+    baseline: dict,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[BenchComparison]:
+    """Compare per-stream fps with the baseline run.
+
+    Configurations missing from the baseline, or failed now, are skipped.
+    """
+    baseline_fps = {_config_key(r): r["fps"] for r in baseline["results"]}
+    comparisons = []
+    for result in results:
+        key = _config_key(result.config)
+        if result.error or key not in baseline_fps:
+            continue
+        comparison = BenchComparison(result.config, baseline_fps[key], result.fps)
+        comparison.regressed = comparison.change < -threshold
+        comparisons.append(comparison)
+    return comparisons
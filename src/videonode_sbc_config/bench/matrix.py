@@ -0,0 +1,33 @@
+"""Standard benchmark matrix."""
+
+from collections.abc import Sequence
+
+from .types import BenchConfig
+
+ENCODERS = ["h264_rkmpp", "hevc_rkmpp"]
+RESOLUTIONS: dict[str, tuple[int, int]] = {
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+}
+BITRATES = ["2M", "4M", "8M"]
+STREAM_COUNTS = [1, 2, 4]
+
+
+def build_matrix(
+    encoders: Sequence[str] = (),
+    resolutions: Sequence[str] = (),
+    bitrates: Sequence[str] = (),
+    streams: Sequence[int] = (),
+) -> list[BenchConfig]:
+    """Build benchmark configurations; empty filters select the full axis."""
+    configs = []
+    for encoder in encoders or ENCODERS:
+        for resolution in resolutions or RESOLUTIONS:
+            width, height = RESOLUTIONS[resolution]
+            for bitrate in bitrates or BITRATES:
+                for count in streams or STREAM_COUNTS:
+                    configs.append(
+                        BenchConfig(encoder, resolution, width, height, bitrate, count)
+                    )
+    return configs
@@ -0,0 +1,159 @@
+"""Run benchmark configurations against ffmpeg and collect measurements."""
+
+import os
+import signal
+import subprocess
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+
+from .types import DEFAULT_FRAMES, DEFAULT_TIMEOUT, BenchConfig, BenchResult
+
+# testsrc2 is rendered on the CPU; keep it small and let RGA scale it up so
+# frame generation does not limit the encoder at 4K
+SOURCE_SIZE = "1280x720"
+SOURCE_RATE = 30
+STATS_PERIOD = 0.05  # Seconds between progress reports (latency resolution)
+
+
+def ffmpeg_args(config: BenchConfig, frames: int = DEFAULT_FRAMES) -> list[str]:
+    """ffmpeg arguments for one stream of a configuration."""
+    return [
+        "-hide_banner",
+        "-nostdin",
+        "-loglevel",
+        "error",
+        "-init_hw_device",
+        "rkmpp=hw",
+        "-filter_hw_device",
+        "hw",
+        "-f",
+        "lavfi",
+        "-i",
+        f"testsrc2=size={SOURCE_SIZE}:rate={SOURCE_RATE}",
+        "-vf",
+        f"format=nv12,hwupload,scale_rkrga=w={config.width}:h={config.height}"
+        ":format=nv12",
+        "-c:v",
+        config.encoder,
+        "-b:v",
+        config.bitrate,
+        "-frames:v",
+        str(frames),
+        "-progress",
+        "pipe:1",
+        "-stats_period",
+        str(STATS_PERIOD),
+        "-f",
+        "null",
+        "-",
+    ]
+
+
+def _parse_float(value: str | None) -> float:
+    try:
+        return float((value or "").rstrip("x"))
+    except ValueError:
+        return 0.0
+
+
+@dataclass
+class _Stream:
+    proc: subprocess.Popen
+    started: float
+    first_frame: float | None = None
+    progress: dict[str, str] = field(default_factory=dict)
+    stderr: str = ""
+
+    def read(self) -> None:
+        """Consume `-progress` key=value lines until ffmpeg exits."""
+        assert self.proc.stdout and self.proc.stderr
+        for line in self.proc.stdout:
+            key, _, value = line.strip().partition("=")
+            if key == "frame" and self.first_frame is None and value not in ("", "0"):
+                self.first_frame = time.monotonic()
+            self.progress[key] = value
+        self.stderr = self.proc.stderr.read()
+
+
+def run_config(
+    config: BenchConfig,
+    ffmpeg: Sequence[str] = ("ffmpeg",),
+    frames: int = DEFAULT_FRAMES,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> BenchResult:
+    """Run config.streams concurrent encoders and measure them."""
+    started = time.monotonic()
+    streams = []
+    for _ in range(config.streams):
+        # Own session so a timeout can kill ffmpeg and anything it spawned
+        proc = subprocess.Popen(
+            [*ffmpeg, *ffmpeg_args(config, frames)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=True,
+        )
+        streams.append(_Stream(proc, time.monotonic()))
+
+    readers = [threading.Thread(target=s.read, daemon=True) for s in streams]
+    for reader in readers:
+        reader.start()
+
+    timed_out = False
+    deadline = started + timeout
+    for reader, stream in zip(readers, streams):
+        reader.join(max(0.0, deadline - time.monotonic()))
+        if reader.is_alive():
+            timed_out = True
+            os.killpg(stream.proc.pid, signal.SIGKILL)
+            reader.join()
+
+    cpu_time = 0.0
+    for stream in streams:
+        # wait4 reaps the process and reports the CPU time it used
+        _, status, usage = os.wait4(stream.proc.pid, 0)
+        stream.proc.returncode = os.waitstatus_to_exitcode(status)
+        cpu_time += usage.ru_utime + usage.ru_stime
+    wall = time.monotonic() - started
+
+    result = BenchResult(config)
+    if timed_out:
+        result.error = f"No result after {timeout:g}s"
+        return result
+    failed = next((s for s in streams if s.proc.returncode != 0), None)
+    if failed:
+        lines = failed.stderr.strip().splitlines()
+        result.error = lines[-1] if lines else f"exit {failed.proc.returncode}"
+        return result
+
+    fps = [_parse_float(s.progress.get("fps")) for s in streams]
+    latencies = [
+        (s.first_frame - s.started) * 1000 for s in streams if s.first_frame
+    ]
+    result.fps = sum(fps) / len(fps)
+    result.min_fps = min(fps)
+    result.speed = sum(_parse_float(s.progress.get("speed")) for s in streams) / len(
+        streams
+    )
+    result.cpu_percent = cpu_time * 100 / (wall * (os.cpu_count() or 1))
+    result.latency_ms = sum(latencies) / len(latencies) if latencies else 0.0
+    return result
+
+
+def run_benchmark(
+    configs: Sequence[BenchConfig],
+    ffmpeg: Sequence[str] = ("ffmpeg",),
+    frames: int = DEFAULT_FRAMES,
+    timeout: float = DEFAULT_TIMEOUT,
+    on_result: Callable[[BenchResult], None] | None = None,
+) -> list[BenchResult]:
+    """Run configurations one after another (they compete for the VPU)."""
+    results = []
+    for config in configs:
+        result = run_config(config, ffmpeg, frames, timeout)
+        if on_result:
+            on_result(result)
+        results.append(result)
+    return results
@@ -0,0 +1,50 @@
+"""Stand-in for ffmpeg so the benchmark harness runs without a Rockchip board.
+
+Understands the arguments built by runner.ffmpeg_args(): it simulates an
+encoder with a fixed pixel throughput, prints `-progress` blocks while
+"encoding" and exits 0. Set VIDEONODE_BENCH_STUB_FAIL to make it fail.
+
+Usage:
+    python -m videonode_sbc_config.bench.stub <ffmpeg args>
+"""
+
+import os
+import re
+import sys
+import time
+
+PIXEL_RATE = 2_000_000_000  # Simulated pixels per second
+SOURCE_RATE = 30
+
+
+def _arg(args: list[str], name: str, default: str = "") -> str:
+    return args[args.index(name) + 1] if name in args[:-1] else default
+
+
+def main(args: list[str]) -> int:
+    if os.environ.get("VIDEONODE_BENCH_STUB_FAIL"):
+        print("Stub failure requested", file=sys.stderr)
+        return 1
+
+    frames = int(_arg(args, "-frames:v", "300"))
+    period = float(_arg(args, "-stats_period", "0.5"))
+    size = re.search(r"w=(\d+):h=(\d+)", _arg(args, "-vf"))
+    pixels = int(size[1]) * int(size[2]) if size else 1920 * 1080
+    fps = PIXEL_RATE / pixels
+
+    started = time.monotonic()
+    done = 0
+    while done < frames:
+        time.sleep(min(period, (frames - done) / fps))
+        done = min(frames, int((time.monotonic() - started) * fps))
+        state = "end" if done >= frames else "continue"
+        print(
+            f"frame={done}\nfps={fps:.1f}\nspeed={fps / SOURCE_RATE:.2f}x\n"
+            f"progress={state}",
+            flush=True,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
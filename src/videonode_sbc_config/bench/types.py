@@ -0,0 +1,69 @@
+"""Encoder benchmark types."""
+
+from dataclasses import asdict, dataclass
+
+DEFAULT_FRAMES = 300
+DEFAULT_TIMEOUT = 120.0
+
+
+@dataclass(frozen=True)
+class BenchConfig:
+    """One point of the benchmark matrix."""
+
+    encoder: str  # e.g. "h264_rkmpp"
+    resolution: str  # Matrix label, e.g. "1080p"
+    width: int
+    height: int
+    bitrate: str  # ffmpeg -b:v value, e.g. "4M"
+    streams: int  # Concurrent encoder processes
+
+
+@dataclass
+class BenchResult:
+    """Measurements for one benchmark configuration.
+
+    fps and speed are per stream (mean over the concurrent streams),
+    min_fps is the slowest stream. cpu_percent is the CPU time of all
+    streams relative to the wall time of all CPUs (100 = every core busy).
+    latency_ms is the mean time from launch until a stream reports its
+    first encoded frame.
+    """
+
+    config: BenchConfig
+    fps: float = 0.0
+    min_fps: float = 0.0
+    speed: float = 0.0
+    cpu_percent: float = 0.0
+    latency_ms: float = 0.0
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        data = asdict(self.config)
+        data.update(asdict(self))
+        del data["config"]
+        return data
+
+
+@dataclass
+class BenchComparison:
+    """Throughput of a configuration against the stored baseline."""
+
+    config: BenchConfig
+    baseline_fps: float
+    fps: float
+    regressed: bool = False
+
+    @property
+    def change(self) -> float:
+        """Relative fps change (-0.2 = 20% slower)."""
+        return self.fps / self.baseline_fps - 1 if self.baseline_fps else 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self.config)
+        data.update(
+            baseline_fps=self.baseline_fps,
+            fps=self.fps,
+            change=round(self.change, 4),
+            regressed=self.regressed,
+        )
+        return data
@@ -0,0 +1,12 @@
+"""Offline provisioning bundles."""
+
+from .create import create_bundle, get_bundle_packages, read_manifest
+from .types import BUNDLE_SUFFIX, TARGET_BUNDLE_DIR
+
+__all__ = [
+    "BUNDLE_SUFFIX",
+    "TARGET_BUNDLE_DIR",
+    "create_bundle",
+    "get_bundle_packages",
+    "read_manifest",
+]
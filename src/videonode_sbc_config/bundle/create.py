@@ -0,0 +1,265 @@
+"""Build and read provisioning bundles.
+
+A bundle is an uncompressed tar (its large members are compressed
+already) holding everything deploys/setup.py would otherwise compile or
+download: the MPP/RGA/FFmpeg artifacts from the artifact cache, compiled
+overlays, udev rules, the Alloy archive, the cockpit-navigator package
+and the .deb files of every package the components install, with their
+dependencies. It is built once on a provisioned board of the target
+class (or a host sharing its artifact cache) and needs neither a compiler
+nor network access to install.
+"""
+
+import hashlib
+import io
+import json
+import shutil
+import subprocess
+import tarfile
+import tempfile
+import time
+import urllib.request
+from collections.abc import Sequence
+from pathlib import Path
+
+from videonode_sbc_config.deploys.build import (
+    SourceBuild,
+    get_artifact_key,
+    get_artifact_path,
+)
+from videonode_sbc_config.deploys.generic.alloy import ALLOY_URL, ALLOY_VERSION
+from videonode_sbc_config.deploys.generic.cockpit import COCKPIT_PACKAGES, NAVIGATOR_URL
+from videonode_sbc_config.deploys.generic.led_permissions import (
+    UDEV_RULES as LED_UDEV_RULES,
+)
+from videonode_sbc_config.deploys.hardware.rockchip.ffmpeg import get_ffmpeg_build
+from videonode_sbc_config.deploys.hardware.rockchip.mpp import MPP_BUILD
+from videonode_sbc_config.deploys.hardware.rockchip.overlays import OVERLAYS
+from videonode_sbc_config.deploys.hardware.rockchip.permissions import UDEV_RULES
+from videonode_sbc_config.deploys.hardware.rockchip.rga import RGA_BUILD
+from videonode_sbc_config.deploys.hardware.rockchip.versions import (
+    FFMPEG_VERSION,
+    MPP_VERSION,
+    RGA_BRANCH,
+)
+from videonode_sbc_config.deploys.overlay_cache import get_cached_overlay, get_dtbo_name
+from videonode_sbc_config.deploys.utils import get_runtime_dependencies
+from videonode_sbc_config.platform import Platform
+
+from .types import (
+    ARTIFACTS_DIR,
+    BUNDLE_VERSION,
+    DEBS_DIR,
+    MANIFEST,
+    OVERLAYS_DIR,
+    UDEV_DIR,
+)
+
+EXTRA_PACKAGES = ["unzip"]  # Used by the Alloy deploy to extract its archive
+DOWNLOADS = [NAVIGATOR_URL, ALLOY_URL]  # Served from DEBS_DIR by file name
+UDEV_RULE_FILES = {
+    "99-rockchip-permissions.rules": UDEV_RULES,
+    "99-led-permissions.rules": LED_UDEV_RULES,
+}
+
+
+def get_bundle_builds(profile: str) -> list[SourceBuild]:
+    """Get the source builds of the stack for an FFmpeg profile."""
+    ffmpeg_build = get_ffmpeg_build(profile)
+    if ffmpeg_build is None:
+        raise ValueError(f"Unknown FFmpeg profile: {profile}")
+    return [MPP_BUILD, RGA_BUILD, ffmpeg_build]
+
+
+def get_bundle_packages() -> list[str]:
+    """Get the apt packages a node provisioned from a bundle installs."""
+    packages = set(COCKPIT_PACKAGES)
+    packages.update(get_runtime_dependencies("mpp", "rga", "ffmpeg"))
+    packages.update(EXTRA_PACKAGES)
+    return sorted(packages)
+
+
+def resolve_dependencies(packages: Sequence[str]) -> list[str]:
+    """Get packages plus everything they depend on, recursively."""
+    output = subprocess.run(
+        [
+            "apt-cache",
+            "depends",
+            "--recurse",
+            "--no-recommends",
+            "--no-suggests",
+            "--no-conflicts",
+            "--no-breaks",
+            "--no-replaces",
+            "--no-enhances",
+            *packages,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    # Package names start a line; dependencies are indented, virtual
+    # packages are shown as <name>
+    return sorted(
+        {
+            line.strip()
+            for line in output.splitlines()
+            if line and not line[0].isspace() and not line.startswith("<")
+        }
+    )
+
+
+def download_debs(packages: Sequence[str], dest: Path) -> None:
+    """Download .deb files of packages and their dependencies into dest."""
+    subprocess.run(
+        ["apt-get", "download", *resolve_dependencies(packages)],
+        cwd=dest,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def index_debs(repo_dir: Path) -> None:
+    """Write the flat repository index, if an indexer is installed.
+
+    Targets index a directory without one themselves (see
+    deploys/generic/apt_sources.py).
+    """
+    for command in (["apt-ftparchive", "packages", "."], ["dpkg-scanpackages", "."]):
+        if shutil.which(command[0]):
+            output = subprocess.run(
+                command,
+                cwd=repo_dir,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            (repo_dir / "Packages").write_text(output)
+            return
+
+
+def fetch_download(url: str, dest_dir: Path, source_dir: Path | None = None) -> None:
+    """Copy the file of url from source_dir (by file name) or download it."""
+    name = url.rsplit("/", 1)[-1]
+    if source_dir:
+        shutil.copy2(source_dir / name, dest_dir / name)
+        return
+    with urllib.request.urlopen(url) as response, (dest_dir / name).open("wb") as f:
+        shutil.copyfileobj(response, f)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def create_bundle(
+    output: Path,
+    platform: Platform,
+    arch: str,
+    profile: str,
+    artifact_cache: Path,
+    debs_dir: Path | None = None,
+    downloads_dir: Path | None = None,
+) -> dict:
+    """Write a bundle to output and return its manifest.
+
+    debs_dir and downloads_dir supply pre-fetched .deb files and download
+    artifacts; without them they are fetched with apt-get and from the
+    upstream URLs. Raises ValueError if an artifact is not in the cache
+    and OSError or CalledProcessError if fetching or compiling fails.
+    """
+    members: dict[str, Path] = {}  # Archive name -> file
+    artifacts: dict[str, str] = {}
+    missing = []
+    for build in get_bundle_builds(profile):
+        key = get_artifact_key(build.repo, build.ref, build.flags, arch)
+        artifact = Path(get_artifact_path(str(artifact_cache), build.project, key))
+        if not artifact.is_file():
+            missing.append(str(artifact))
+            continue
+        members[f"{ARTIFACTS_DIR}/{artifact.name}"] = artifact
+        artifacts[build.project] = key
+    if missing:
+        raise ValueError(
+            "Artifacts missing (run setup on a board of this class first): "
+            + ", ".join(missing)
+        )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for directory in (OVERLAYS_DIR, UDEV_DIR, DEBS_DIR):
+            (root / directory).mkdir()
+
+        for overlay in OVERLAYS:
+            dtbo = get_cached_overlay(overlay)
+            shutil.copy2(dtbo, root / OVERLAYS_DIR / dtbo.name)
+        for name, rules in UDEV_RULE_FILES.items():
+            (root / UDEV_DIR / name).write_text(rules)
+
+        debs = root / DEBS_DIR
+        if debs_dir:
+            for deb in debs_dir.glob("*.deb"):
+                shutil.copy2(deb, debs / deb.name)
+        else:
+            download_debs(get_bundle_packages(), debs)
+        index_debs(debs)
+        for url in DOWNLOADS:
+            fetch_download(url, debs, downloads_dir)
+
+        for path in sorted(root.rglob("*")):
+            if path.is_file():
+                members[path.relative_to(root).as_posix()] = path
+
+        manifest = {
+            "version": BUNDLE_VERSION,
+            "created": time.time(),
+            "platform": platform.to_dict(),
+            "arch": arch,
+            "ffmpeg_profile": profile,
+            "versions": {
+                "ffmpeg": FFMPEG_VERSION,
+                "mpp": MPP_VERSION,
+                "rga": RGA_BRANCH,
+                "alloy": ALLOY_VERSION,
+            },
+            "artifacts": artifacts,
+            "overlays": {overlay.id: get_dtbo_name(overlay) for overlay in OVERLAYS},
+            "packages": get_bundle_packages(),
+            "files": {
+                name: {"size": path.stat().st_size, "sha256": _sha256(path)}
+                for name, path in members.items()
+            },
+        }
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        partial = output.with_name(output.name + ".tmp")
+        with tarfile.open(partial, "w") as tar:
+            data = json.dumps(manifest, indent=2).encode()
+            info = tarfile.TarInfo(MANIFEST)
+            info.size = len(data)
+            info.mtime = int(manifest["created"])
+            tar.addfile(info, fileobj=io.BytesIO(data))
+            for name, path in members.items():
+                tar.add(path, arcname=name, recursive=False)
+        partial.replace(output)
+    return manifest
+
+
+def read_manifest(path: Path) -> dict:
+    """Read the manifest of a bundle.
+
+    Raises ValueError if path is not a bundle of a supported version.
+    """
+    try:
+        with tarfile.open(path) as tar:
+            member = tar.extractfile(MANIFEST)
+            manifest = json.load(member) if member else None
+    except (OSError, KeyError, tarfile.TarError, ValueError) as e:
+        raise ValueError(f"Not a provisioning bundle: {path} ({e})") from e
+    if not isinstance(manifest, dict) or manifest.get("version") != BUNDLE_VERSION:
+        raise ValueError(f"Unsupported bundle version in {path}")
+    return manifest
@@ -0,0 +1,14 @@
+"""Provisioning bundle layout."""
+
+BUNDLE_VERSION = 1
+BUNDLE_SUFFIX = ".tar"
+
+# Archive members
+MANIFEST = "manifest.json"
+ARTIFACTS_DIR = "artifacts"  # <project>-<key>.tar.gz, artifact cache layout
+OVERLAYS_DIR = "overlays"  # Overlay cache files, <overlay id>-<content hash>.dtbo
+UDEV_DIR = "udev"  # Copies of the rules the permission deploys write (reference)
+DEBS_DIR = "debs"  # .deb files with a Packages index, plus download artifacts
+
+# Where deploys/bundle.py unpacks a bundle on the target
+TARGET_BUNDLE_DIR = "/var/lib/videonode-sbc-config/bundle"
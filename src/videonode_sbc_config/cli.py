@@ -1,10 +1,54 @@
 import json as json_module
+import os
+import shutil
+import subprocess
 import sys
+import time
+from pathlib import Path
 
 import click
 
+from videonode_sbc_config.bench import (
+    DEFAULT_THRESHOLD,
+    ENCODERS,
+    RESOLUTIONS,
+    BenchResult,
+    build_matrix,
+    compare_results,
+    get_fingerprint,
+    get_stack_versions,
+    load_baseline,
+    run_benchmark,
+    save_run,
+    stub_ffmpeg,
+)
+from videonode_sbc_config.bench.types import DEFAULT_FRAMES, DEFAULT_TIMEOUT
+from videonode_sbc_config.fleet import (
+    DEFAULT_PARALLEL,
+    DEFAULT_SETUP_COMPONENTS,
+    LOCAL_INVENTORY,
+    SETUP_COMPONENTS,
+    run_setup,
+)
 from videonode_sbc_config.platform import detect_platform
 
+HOSTS_HELP = "pyinfra inventory file or comma separated hosts"
+
+
+def _checks_to_json(results: list) -> list[dict]:
+    return [
+        {
+            "name": c.name,
+            "status": c.status.value,
+            "message": c.message,
+            "remediation": c.remediation,
+            "duration": round(c.duration, 6),
+            "spawn_time": None if c.spawn_time is None else round(c.spawn_time, 6),
+            "output_bytes": c.output_bytes,
+        }
+        for c in results
+    ]
+
 
 @click.group(invoke_without_command=True)
 @click.pass_context
@@ -22,64 +66,415 @@ def main(ctx: click.Context) -> None:
     "--verbose", "-v", is_flag=True, help="Show remediation hints for failures"
 )
 @click.option("--json", "as_json", is_flag=True, help="Output as JSON")
-def status(verbose: bool, as_json: bool) -> None:
-    """Show SBC configuration status (non-interactive)."""
+@click.option("--watch", is_flag=True, help="Keep refreshing until Ctrl+C")
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0.1),
+    default=1.0,
+    show_default=True,
+    help="Refresh interval in seconds for --watch",
+)
+@click.option("--hosts", "inventory", help=f"Check remote hosts ({HOSTS_HELP})")
+@click.option(
+    "--parallel",
+    type=click.IntRange(min=1),
+    default=DEFAULT_PARALLEL,
+    show_default=True,
+    help="Hosts checked at the same time with --hosts",
+)
+@click.option("--profile", is_flag=True, help="Show the slowest checks and totals")
+def status(
+    verbose: bool,
+    as_json: bool,
+    watch: bool,
+    interval: float,
+    inventory: str | None,
+    parallel: int,
+    profile: bool,
+) -> None:
+    """Show SBC configuration status (non-interactive).
+
+    Exits with the number of failed checks, or with --hosts the number of
+    failing hosts.
+    """
+    # rich/readchar are only imported for terminal output so that
+    # `status --json` stays cheap for cron and health-check scripts
     from videonode_sbc_config.deploys.verify import CheckStatus, run_all_checks
-    from videonode_sbc_config.ui import render_dashboard
+
+    if watch and as_json:
+        raise click.UsageError("--watch cannot be combined with --json")
+    if watch and inventory:
+        raise click.UsageError("--watch cannot be combined with --hosts")
+    if profile and (watch or inventory):
+        raise click.UsageError("--profile cannot be combined with --watch or --hosts")
+
+    if inventory:
+        from videonode_sbc_config.fleet import get_fleet_status
+
+        statuses = get_fleet_status(inventory, parallel)
+        if as_json:
+            data = {
+                "hosts": [
+                    {
+                        "host": s.host,
+                        "platform": s.platform.to_dict() if s.platform else None,
+                        "error": s.error,
+                        "checks": _checks_to_json(s.results),
+                    }
+                    for s in statuses
+                ]
+            }
+            click.echo(json_module.dumps(data, indent=2))
+        else:
+            from videonode_sbc_config.ui import render_fleet_status
+
+            render_fleet_status(statuses, verbose=verbose)
+        sys.exit(sum(1 for s in statuses if not s.healthy))
 
     platform = detect_platform()
-    results = run_all_checks(platform)
+
+    if watch:
+        from videonode_sbc_config.ui import watch_dashboard
+
+        results = watch_dashboard(platform, interval=interval, verbose=verbose)
+    else:
+        started = time.perf_counter()
+        results = run_all_checks(platform)
+        wall_time = time.perf_counter() - started
+        if as_json:
+            data = {
+                "platform": platform.to_dict(),
+                "duration": round(wall_time, 6),
+                "checks": _checks_to_json(results),
+            }
+            click.echo(json_module.dumps(data, indent=2))
+        else:
+            from videonode_sbc_config.ui import render_check_profile, render_dashboard
+
+            render_dashboard(platform, results, verbose=verbose)
+            if profile:
+                render_check_profile(results, wall_time)
+
+    failed = sum(
+        1 for r in results if r.status in (CheckStatus.FAIL, CheckStatus.TIMEOUT)
+    )
+    sys.exit(failed)
+
+
+@main.command()
+@click.option(
+    "--encoder",
+    "encoders",
+    multiple=True,
+    type=click.Choice(ENCODERS),
+    help="Encoder to test (repeatable, default: all)",
+)
+@click.option(
+    "--resolution",
+    "resolutions",
+    multiple=True,
+    type=click.Choice(list(RESOLUTIONS)),
+    help="Output resolution (repeatable, default: all)",
+)
+@click.option(
+    "--bitrate",
+    "bitrates",
+    multiple=True,
+    help="Target bitrate such as 4M (repeatable, default: 2M, 4M, 8M)",
+)
+@click.option(
+    "--streams",
+    multiple=True,
+    type=click.IntRange(min=1),
+    help="Concurrent stream count (repeatable, default: 1, 2, 4)",
+)
+@click.option(
+    "--frames",
+    type=click.IntRange(min=1),
+    default=DEFAULT_FRAMES,
+    show_default=True,
+    help="Frames encoded per stream",
+)
+@click.option(
+    "--timeout",
+    type=float,
+    default=DEFAULT_TIMEOUT,
+    show_default=True,
+    help="Seconds before a configuration is aborted",
+)
+@click.option("--ffmpeg", "ffmpeg_path", default="ffmpeg", help="ffmpeg binary")
+@click.option("--stub", is_flag=True, help="Run against a stub ffmpeg (no hardware)")
+@click.option(
+    "--save/--no-save",
+    default=None,
+    help="Store results as the board's new baseline "
+    "(default: unless --stub or a regression was flagged)",
+)
+@click.option(
+    "--compare",
+    is_flag=True,
+    help="Compare fps with the board's last baseline of another stack",
+)
+@click.option(
+    "--threshold",
+    type=float,
+    default=DEFAULT_THRESHOLD,
+    show_default=True,
+    help="Relative fps drop flagged as a regression",
+)
+@click.option(
+    "--store",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Baseline store (default: $XDG_DATA_HOME/videonode-sbc-config/bench.jsonl)",
+)
+@click.option("--json", "as_json", is_flag=True, help="Output as JSON")
+def bench(
+    encoders: tuple[str, ...],
+    resolutions: tuple[str, ...],
+    bitrates: tuple[str, ...],
+    streams: tuple[int, ...],
+    frames: int,
+    timeout: float,
+    ffmpeg_path: str,
+    stub: bool,
+    save: bool | None,
+    compare: bool,
+    threshold: float,
+    store: Path | None,
+    as_json: bool,
+) -> None:
+    """Benchmark hardware encoders (fps, speed, CPU%, latency).
+
+    Exits with the number of failed configurations plus, with --compare,
+    the number of regressions.
+    """
+    if stub:
+        ffmpeg = stub_ffmpeg()
+    elif shutil.which(ffmpeg_path):
+        ffmpeg = [ffmpeg_path]
+    else:
+        raise click.ClickException(f"ffmpeg not found: {ffmpeg_path}")
+
+    configs = build_matrix(encoders, resolutions, bitrates, streams)
+
+    def report(result: BenchResult) -> None:
+        c = result.config
+        outcome = result.error or f"{result.fps:.1f} fps"
+        click.echo(
+            f"{c.encoder} {c.resolution} {c.bitrate} x{c.streams}: {outcome}",
+            err=True,
+        )
+
+    results = run_benchmark(
+        configs, ffmpeg, frames, timeout, on_result=None if as_json else report
+    )
+
+    platform = detect_platform()
+    versions = get_stack_versions()
+    fingerprint = get_fingerprint(platform, versions)
+    comparisons = None
+    baseline = None
+    if compare:
+        baseline = load_baseline(platform, frames, store, fingerprint)
+        if baseline:
+            comparisons = compare_results(results, baseline, threshold)
+        else:
+            click.echo("No baseline stored for this board yet", err=True)
+    regressed = sum(1 for c in comparisons or [] if c.regressed)
+    if save is None:
+        save = not stub and not regressed
+        if regressed and not stub:
+            click.echo("Regressed run not stored as baseline (use --save)", err=True)
+    if save:
+        save_run(platform, results, frames, store)
 
     if as_json:
         data = {
-            "platform": {
-                "sbc_family": platform.sbc_family.name,
-                "sbc_model": platform.sbc_model.name,
-                "os_type": platform.os_type.name,
-                "os_version": platform.os_version,
-                "kernel_version": platform.kernel_version,
-                "board": platform.board,
-            },
-            "checks": [
-                {
-                    "name": c.name,
-                    "status": c.status.value,
-                    "message": c.message,
-                    "remediation": c.remediation,
-                }
-                for c in results
-            ],
+            "platform": platform.to_dict(),
+            "versions": versions,
+            "fingerprint": fingerprint,
+            "ffmpeg": " ".join(ffmpeg),
+            "frames": frames,
+            "results": [r.to_dict() for r in results],
         }
+        if baseline and comparisons is not None:
+            data["comparison"] = {
+                "baseline": {
+                    k: baseline[k] for k in ("timestamp", "fingerprint", "versions")
+                },
+                "threshold": threshold,
+                "results": [c.to_dict() for c in comparisons],
+            }
         click.echo(json_module.dumps(data, indent=2))
     else:
-        render_dashboard(platform, results, verbose=verbose)
+        from videonode_sbc_config.ui import render_bench_results
 
-    failed = sum(1 for r in results if r.status == CheckStatus.FAIL)
-    sys.exit(failed)
+        render_bench_results(
+            results, comparisons, baseline["versions"] if baseline else None
+        )
+
+    failed = sum(1 for r in results if r.error)
+    sys.exit(failed + regressed)
+
+
+@main.command()
+@click.option("--hosts", "inventory", default=LOCAL_INVENTORY, help=HOSTS_HELP)
+@click.option(
+    "--parallel",
+    type=click.IntRange(min=1),
+    default=DEFAULT_PARALLEL,
+    show_default=True,
+    help="Hosts deployed at the same time",
+)
+@click.option(
+    "--component",
+    "components",
+    multiple=True,
+    type=click.Choice(SETUP_COMPONENTS),
+    help="Component to install (repeatable, default: stack)",
+)
+@click.option(
+    "--data",
+    "data",
+    multiple=True,
+    metavar="KEY=VALUE",
+    help="Extra deploy setting, e.g. ffmpeg_profile=rk3588-perf (repeatable)",
+)
+@click.option(
+    "--trace",
+    type=click.Path(dir_okay=False),
+    help="Write operation timings as a Chrome trace-event JSON file",
+)
+@click.option(
+    "--from-bundle",
+    "bundle_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Install from a provisioning bundle (see bundle), without compiling",
+)
+def setup(
+    inventory: str,
+    parallel: int,
+    components: tuple[str, ...],
+    data: tuple[str, ...],
+    trace: str | None,
+    bundle_path: Path | None,
+) -> None:
+    """Install components on this node or across an inventory.
+
+    Prints the time spent per phase (apt, checkout, configure, build,
+    install, ...) when the deploy finishes.
+    """
+    components = components or DEFAULT_SETUP_COMPONENTS
+    try:
+        returncode = run_setup(
+            inventory, components, parallel, data, trace, bundle_path
+        )
+    except ValueError as e:
+        raise click.ClickException(str(e)) from e
+    sys.exit(returncode)
+
+
+@main.command("bundle")
+@click.argument("output", type=click.Path(dir_okay=False, path_type=Path))
+@click.option(
+    "--profile",
+    default="generic",
+    show_default=True,
+    help="FFmpeg build profile of the bundled artifacts",
+)
+@click.option(
+    "--arch",
+    help="Target architecture (default: this machine's; another one needs --debs)",
+)
+@click.option(
+    "--artifact-cache",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="Artifact cache holding the builds (default: this machine's)",
+)
+@click.option(
+    "--debs",
+    "debs_dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="Take .deb files from this directory instead of apt-get download",
+)
+@click.option(
+    "--downloads",
+    "downloads_dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="Take cockpit-navigator and Alloy from this directory, not the web",
+)
+def bundle_command(
+    output: Path,
+    profile: str,
+    arch: str | None,
+    artifact_cache: Path | None,
+    debs_dir: Path | None,
+    downloads_dir: Path | None,
+) -> None:
+    """Build an offline provisioning bundle for boards like this one.
+
+    Packs the MPP/RGA/FFmpeg builds from the artifact cache (run setup
+    first), compiled overlays, udev rules, Alloy and the .deb packages into
+    one archive for `setup --from-bundle`.
+    """
+    from videonode_sbc_config.bundle import create_bundle
+    from videonode_sbc_config.deploys.build import ARTIFACT_CACHE_DIR
+
+    machine = os.uname().machine
+    if arch and arch != machine and not debs_dir:
+        # apt-get download only fetches packages of this machine's architecture
+        raise click.UsageError(f"--arch {arch} needs --debs with packages for it")
+
+    try:
+        manifest = create_bundle(
+            output,
+            detect_platform(),
+            arch or machine,
+            profile,
+            artifact_cache or Path(ARTIFACT_CACHE_DIR),
+            debs_dir,
+            downloads_dir,
+        )
+    except (ValueError, OSError, subprocess.CalledProcessError) as e:
+        raise click.ClickException(str(e)) from e
+
+    size_mb = sum(f["size"] for f in manifest["files"].values()) / 1e6
+    click.echo(
+        f"Wrote {output}: {len(manifest['files'])} files, {size_mb:.1f} MB "
+        f"({manifest['arch']}, FFmpeg profile {manifest['ffmpeg_profile']})"
+    )
 
 
 @main.command()
+@click.option("--hosts", "inventory", default=LOCAL_INVENTORY, help=HOSTS_HELP)
 @click.option("--token", required=True, help="Grafana Cloud API token")
 @click.option("--username", required=True, help="Grafana Cloud username/user ID")
 @click.option("--url", required=True, help="Grafana Cloud Prometheus push URL")
-def alloy(token: str, username: str, url: str) -> None:
+@click.option(
+    "--from-bundle",
+    "from_bundle",
+    is_flag=True,
+    help="Install the Alloy archive of the bundle unpacked by setup --from-bundle",
+)
+def alloy(
+    inventory: str, token: str, username: str, url: str, from_bundle: bool
+) -> None:
     """Setup Grafana Alloy metrics collection."""
-    import subprocess
-    from importlib.resources import files
+    data = []
+    if from_bundle:
+        from videonode_sbc_config.bundle import TARGET_BUNDLE_DIR
 
-    deploys = files("videonode_sbc_config.deploys")
-    path = deploys.joinpath("generic/alloy.py")
+        data = ["--data", f"download_mirror={TARGET_BUNDLE_DIR}/debs"]
     subprocess.run(
         [
             "pyinfra",
-            "@local",
-            str(path),
-            "--data",
+            inventory,
+            *data,
+            "videonode_sbc_config.deploys.generic.alloy.install_alloy",
             f"grafana_cloud_token={token}",
-            "--data",
             f"grafana_cloud_username={username}",
-            "--data",
             f"grafana_cloud_url={url}",
+            "-y",
         ],
         check=True,
     )
@@ -0,0 +1,476 @@
+"""
+Shared helpers for source builds of the hardware acceleration stack.
+
+Builds install into a staging directory which is packed into a tarball
+in a content-addressed artifact cache. The cache key covers everything
+that changes the installed output (repo, ref, configure flags, arch), so
+any board with the same key can unpack the artifact instead of building.
+The cache directory may be shared between boards (NFS, rsync).
+
+After a successful install a stamp file records the key, so a later
+deploy with the same key is a no-op unless a rebuild is requested.
+
+Independent builds passed together to install_source_builds() compile
+concurrently; the job count per build accounts for the other builds and
+the memory each of their jobs needs (see utils.get_parallel_jobs).
+
+With --data ccache=true, compilers run through ccache with a persistent,
+size-capped cache (ccache_dir, ccache_max_size), so a version bump only
+recompiles the translation units that changed. The hit and miss counts of
+the build are logged after it finishes.
+
+Sources are fetched shallowly into a bare mirror per repo (git_mirror_dir,
+default <build base>/mirrors, which may be shared over NFS or rsync) and
+checked out into a persistent working tree, so a ref change or a retry
+only transfers the objects for that ref.
+
+Build trees (objects and the staged install) live outside the checkout.
+With build_location=auto (the default) they go on a tmpfs sized from
+utils.BUILD_TREE_MB when the target has enough free memory, and on disk
+under the build base otherwise; build_location=tmpfs or disk forces
+either. Checkouts, mirrors and the artifact cache always stay on disk.
+
+Build dependencies (runtime libraries for builds unpacked from the
+artifact cache) are installed with apt unless the caller already did
+(install_deps=False); get_build_packages() lists them for such a caller,
+e.g. the single package transaction of deploys/setup.py.
+"""
+
+import hashlib
+import re
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from io import StringIO
+
+from pyinfra import logger
+from pyinfra.api.deploy import deploy
+from pyinfra.context import host
+from pyinfra.facts.files import File
+from pyinfra.facts.server import Arch, Command, Home
+from pyinfra.operations import apt, files, python, server
+
+from videonode_sbc_config.deploys.utils import (
+    APT_CACHE_TIME,
+    get_bool_data,
+    get_build_dependencies,
+    get_parallel_jobs,
+    get_runtime_dependencies,
+    get_tmpfs_build_size,
+)
+
+ARTIFACT_CACHE_DIR = "/var/cache/videonode-sbc-config/artifacts"
+STAMP_DIR = "/var/lib/videonode-sbc-config/stamps"
+CCACHE_DIR = "/var/cache/videonode-sbc-config/ccache"
+CCACHE_MAX_SIZE = "5G"
+BUILD_TMPFS_DIR = "/run/videonode-sbc-config/build"
+
+
+@dataclass(frozen=True)
+class SourceBuild:
+    """A project built from a git ref and installed under /usr."""
+
+    project: str  # Artifact/stamp name, also the BUILD_DEPS category
+    title: str  # Display name in operation names
+    repo: str
+    ref: str
+    build_system: str  # "cmake", "meson" or "configure"
+    flags: tuple[str, ...]
+    directory: str  # Checkout directory name under the build base
+    profile: str = ""  # Build profile name, recorded in the stamp
+
+
+def get_artifact_key(repo: str, ref: str, flags: Sequence[str], arch: str) -> str:
+    """Get cache key for a build from everything that affects its output."""
+    content = "\n".join([repo, ref, arch, *flags])
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def get_artifact_path(cache_dir: str, project: str, key: str) -> str:
+    """Get path of the artifact tarball for a project build."""
+    return f"{cache_dir}/{project}-{key}.tar.gz"
+
+
+def pack_artifact_commands(stage_dir: str, artifact: str) -> list[str]:
+    """Commands to pack a staged install into the artifact cache."""
+    cache_dir = artifact.rsplit("/", 1)[0]
+    return [
+        f"mkdir -p {cache_dir}",
+        f"tar -C {stage_dir} -czf {artifact}.tmp .",
+        f"mv {artifact}.tmp {artifact}",
+    ]
+
+
+def unpack_artifact_commands(artifact: str) -> list[str]:
+    """Commands to install an artifact onto the root filesystem."""
+    return [
+        f"tar -xzf {artifact} -C / --no-overwrite-dir --keep-directory-symlink",
+        "ldconfig",
+    ]
+
+
+def get_stamp_path(project: str) -> str:
+    """Get path of the stamp file recording what is installed for a project."""
+    return f"{STAMP_DIR}/{project}.stamp"
+
+
+def format_stamp(
+    key: str, repo: str, ref: str, flags: Sequence[str], profile: str = ""
+) -> str:
+    """Render stamp file content; the first line holds the artifact key."""
+    stamp = f"key={key}\nrepo={repo}\nref={ref}\nflags={' '.join(flags)}\n"
+    return stamp + f"profile={profile}\n" if profile else stamp
+
+
+def get_installed_key(project: str) -> str:
+    """Get the artifact key of the currently installed build ("" if none)."""
+    stamp = get_stamp_path(project)
+    output = host.get_fact(
+        Command, command=f"sed -n 's/^key=//p' {stamp} 2>/dev/null || true"
+    )
+    return (output or "").strip()
+
+
+def checkout_commands(build: SourceBuild, mirror_dir: str, src_dir: str) -> list[str]:
+    """Commands to update the mirror and check out build.ref into src_dir."""
+    mirror = f"{mirror_dir}/{build.directory}.git"
+    pinned = f"refs/pinned/{build.ref}"
+    return [
+        f"[ -d {mirror} ] || git init -q --bare {mirror}",
+        # Offline sites can run from a pre-synced mirror
+        f"git -C {mirror} fetch -q --depth 1 --force {build.repo} {build.ref}:{pinned}"
+        f" || git -C {mirror} rev-parse -q --verify {pinned}",
+        f"[ -d {src_dir}/.git ] || git init -q {src_dir}",
+        f"git -C {src_dir} fetch -q --depth 1 --force {mirror} {pinned}",
+        f"git -C {src_dir} checkout -q --force --detach FETCH_HEAD",
+        f"git -C {src_dir} clean -q -ffdx",
+    ]
+
+
+def mount_tmpfs_commands(path: str, size_mb: int) -> list[str]:
+    """Commands to mount (or resize) a tmpfs at path."""
+    return [
+        f"mkdir -p {path}",
+        f"if mountpoint -q {path}; then mount -o remount,size={size_mb}m {path}; "
+        f"else mount -t tmpfs -o size={size_mb}m,mode=0755 tmpfs {path}; fi",
+    ]
+
+
+def configure_command(
+    build: SourceBuild, src_dir: str, build_dir: str, launcher: str | None = None
+) -> str:
+    """Command to configure an out-of-tree build directory.
+
+    launcher: Compiler launcher such as "ccache" (not part of the artifact key)
+    """
+    flags = " ".join(build.flags)
+    if build.build_system == "cmake":
+        if launcher:
+            flags += (
+                f" -DCMAKE_C_COMPILER_LAUNCHER={launcher}"
+                f" -DCMAKE_CXX_COMPILER_LAUNCHER={launcher}"
+            )
+        return f"cmake -S {src_dir} -B {build_dir} {flags}"
+    if build.build_system == "meson":
+        env = f"CC='{launcher} cc' CXX='{launcher} c++' " if launcher else ""
+        return f"{env}meson setup {build_dir} {src_dir} {flags}"
+    if launcher:
+        flags += f" --cc='{launcher} gcc' --cxx='{launcher} g++'"
+    return f"mkdir -p {build_dir} && cd {build_dir} && {src_dir}/configure {flags}"
+
+
+def compile_command(build: SourceBuild, build_dir: str, jobs: int) -> str:
+    """Command to compile a configured build directory."""
+    if build.build_system == "meson":
+        return f"ninja -C {build_dir} -j{jobs}"
+    return f"make -C {build_dir} -j{jobs}"
+
+
+def stage_command(build: SourceBuild, build_dir: str, stage_dir: str) -> str:
+    """Command to install a compiled build into a staging directory."""
+    if build.build_system == "meson":
+        return f"DESTDIR={stage_dir} ninja -C {build_dir} install"
+    return f"make -C {build_dir} install DESTDIR={stage_dir}"
+
+
+def parallel_command(commands: dict[str, str], log_dir: str) -> str:
+    """Combine commands into one shell script that runs them concurrently.
+
+    Each command logs to <log_dir>/<name>.log; the script fails if any
+    command fails and prints the tail of its log.
+    """
+    lines = [f"mkdir -p {log_dir}"]
+    for i, (name, command) in enumerate(commands.items()):
+        lines.append(f"( {command} ) > {log_dir}/{name}.log 2>&1 & pid{i}=$!")
+    lines.append("status=0")
+    for i, name in enumerate(commands):
+        lines.append(
+            f"wait $pid{i} || {{ status=1; echo '{name} failed'; "
+            f"tail -n 50 {log_dir}/{name}.log; }}"
+        )
+    lines.append("[ $status -eq 0 ]")
+    return "\n".join(lines)
+
+
+def parse_ccache_stats(output: str) -> tuple[int, int] | None:
+    """Get (hits, misses) from `ccache -s` output, None if not found."""
+    hits = re.search(r"^\s*Hits:\s+(\d+)", output, re.MULTILINE)
+    misses = re.search(r"^\s*Misses:\s+(\d+)", output, re.MULTILINE)
+    if hits and misses:
+        return int(hits[1]), int(misses[1])
+    # ccache 3 lists direct and preprocessed hits separately
+    old_hits = re.findall(r"^cache hit \(\w+\)\s+(\d+)", output, re.MULTILINE)
+    old_misses = re.search(r"^cache miss\s+(\d+)", output, re.MULTILINE)
+    if old_hits and old_misses:
+        return sum(map(int, old_hits)), int(old_misses[1])
+    return None
+
+
+def _log_ccache_stats(env: dict[str, str]) -> None:
+    # The counters were zeroed before the build, so they cover it alone
+    status, output = host.run_shell_command("ccache -s", _env=env)
+    stats = parse_ccache_stats(output.stdout) if status else None
+    if stats is None:
+        logger.warning(f"Could not read ccache statistics: {output.stderr}")
+        return
+    hits, misses = stats
+    total = hits + misses
+    rate = f" ({hits * 100 // total}% hit rate)" if total else ""
+    logger.info(f"ccache: {hits} hits, {misses} misses{rate}")
+
+
+def _record_stamp(
+    build: SourceBuild, stamp: str, after: list[Callable[[], bool]]
+) -> None:
+    files.put(
+        name=f"Record installed {build.title} build",
+        src=StringIO(stamp),
+        dest=get_stamp_path(build.project),
+        mode="644",
+        create_remote_dir=True,
+        _if=after,
+    )
+
+
+def _build_packages(projects: Sequence[str]) -> list[str]:
+    packages = get_build_dependencies("base", *projects)
+    return packages + ["ccache"] if get_bool_data("ccache") else packages
+
+
+def get_build_packages(
+    builds: Sequence[SourceBuild], rebuild: bool = False
+) -> list[str]:
+    """Get the apt packages needed to install builds.
+
+    Builds installed from the artifact cache need their runtime libraries,
+    builds compiled from source their build dependencies and builds that
+    are already installed nothing.
+    """
+    arch = host.get_fact(Arch)
+    cache_dir = host.data.get("artifact_cache") or ARTIFACT_CACHE_DIR
+    cached, compiled = [], []
+    for build in builds:
+        key = get_artifact_key(build.repo, build.ref, build.flags, arch)
+        if not rebuild and get_installed_key(build.project) == key:
+            continue
+        artifact = get_artifact_path(cache_dir, build.project, key)
+        if not rebuild and host.get_fact(File, path=artifact):
+            cached.append(build.project)
+        else:
+            compiled.append(build.project)
+    packages = set(get_runtime_dependencies(*cached))
+    if compiled:
+        packages.update(_build_packages(compiled))
+    return sorted(packages)
+
+
+@deploy("Install source builds")
+def install_source_builds(
+    builds: Sequence[SourceBuild], rebuild: bool = False, install_deps: bool = True
+) -> None:
+    """Install builds from stamp, artifact cache or source, compiling concurrently.
+
+    Builds passed together must not depend on each other. With
+    install_deps=False the build dependencies must already be installed.
+    """
+    user_home = host.get_fact(Home)
+    build_base = f"{user_home}/dev"
+    arch = host.get_fact(Arch)
+    cache_dir = host.data.get("artifact_cache") or ARTIFACT_CACHE_DIR
+
+    cached: list[tuple[SourceBuild, str, str]] = []
+    pending: list[tuple[SourceBuild, str, str]] = []
+    for build in builds:
+        key = get_artifact_key(build.repo, build.ref, build.flags, arch)
+        artifact = get_artifact_path(cache_dir, build.project, key)
+        stamp = format_stamp(key, build.repo, build.ref, build.flags, build.profile)
+
+        if not rebuild and get_installed_key(build.project) == key:
+            logger.info(f"{build.title} {build.ref} already installed, skipping build")
+        elif not rebuild and host.get_fact(File, path=artifact):
+            cached.append((build, artifact, stamp))
+        else:
+            pending.append((build, artifact, stamp))
+
+    runtime_ready = []
+    runtime_packages = get_runtime_dependencies(*(b.project for b, _, _ in cached))
+    if install_deps and runtime_packages:
+        runtime = apt.packages(
+            name="Install runtime dependencies of cached builds",
+            packages=runtime_packages,
+            update=True,
+            cache_time=APT_CACHE_TIME,
+        )
+        runtime_ready.append(runtime.did_succeed)
+
+    for build, artifact, stamp in cached:
+        unpack = server.shell(
+            name=f"Install {build.title} from artifact cache",
+            commands=unpack_artifact_commands(artifact),
+            _if=runtime_ready,
+        )
+        _record_stamp(build, stamp, [unpack.did_succeed])
+
+    if not pending:
+        return
+
+    mirror_dir = host.data.get("git_mirror_dir") or f"{build_base}/mirrors"
+    use_ccache = get_bool_data("ccache")
+    ccache_dir = host.data.get("ccache_dir") or CCACHE_DIR
+    env = {"CCACHE_DIR": ccache_dir} if use_ccache else {}
+
+    titles = " and ".join(build.title for build, _, _ in pending)
+    projects = [build.project for build, _, _ in pending]
+    tmpfs_mb = get_tmpfs_build_size(*projects)
+    try:
+        jobs = get_parallel_jobs(*projects, tmpfs_mb=tmpfs_mb)
+    except ValueError as e:
+        python.raise_exception(ValueError, str(e), name=f"Check {titles} build jobs")
+        return
+
+    deps_ready = []
+    if install_deps:
+        deps = apt.packages(
+            name=f"Install {titles} build dependencies",
+            packages=_build_packages(projects),
+            update=True,
+            cache_time=APT_CACHE_TIME,
+        )
+        deps_ready.append(deps.did_succeed)
+
+    if use_ccache:
+        server.shell(
+            name="Configure ccache",
+            commands=[
+                f"mkdir -p {ccache_dir}",
+                f"ccache -M {host.data.get('ccache_max_size') or CCACHE_MAX_SIZE}",
+                "ccache -z",
+            ],
+            _env=env,
+            _if=deps_ready,
+        )
+
+    files.directory(
+        name="Create build directory",
+        path=build_base,
+        _if=deps_ready,
+    )
+
+    work_dir = BUILD_TMPFS_DIR if tmpfs_mb else build_base
+    ready = list(deps_ready)
+    if tmpfs_mb:
+        mount = server.shell(
+            name=f"Mount {tmpfs_mb} MB tmpfs for build trees",
+            commands=mount_tmpfs_commands(BUILD_TMPFS_DIR, tmpfs_mb),
+            _if=deps_ready,
+        )
+        ready.append(mount.did_succeed)
+    else:
+        logger.info(f"Building {titles} on disk")
+
+    # Build steps ignore their errors so the tmpfs is always unmounted; a
+    # skipped operation counts as succeeded, so each step waits for all
+    # earlier ones and the deploy fails at the end if any of them failed
+    built: list[Callable[[], bool]] = []
+    compile_commands: dict[str, str] = {}
+    for build, _, _ in pending:
+        src_dir = f"{build_base}/{build.directory}"
+        build_dir = f"{work_dir}/build/{build.directory}"
+
+        clone = server.shell(
+            name=f"Check out {build.title} {build.ref}",
+            commands=checkout_commands(build, mirror_dir, src_dir),
+            _if=deps_ready,
+            _retries=2,  # type: ignore[call-arg]
+            _retry_delay=5,  # type: ignore[call-arg]
+            _ignore_errors=True,
+        )
+
+        configure = server.shell(
+            name=f"Configure {build.title}",
+            commands=[
+                f"rm -rf {build_dir}",
+                configure_command(
+                    build, src_dir, build_dir, "ccache" if use_ccache else None
+                ),
+            ],
+            _env=env,
+            _if=[*ready, clone.did_succeed],
+            _ignore_errors=True,
+        )
+        built += [clone.did_succeed, configure.did_succeed]
+        compile_commands[build.project] = compile_command(build, build_dir, jobs)
+
+    if len(compile_commands) == 1:
+        compile_script = next(iter(compile_commands.values()))
+    else:
+        compile_script = parallel_command(compile_commands, f"{build_base}/logs")
+
+    compiled = server.shell(
+        name=f"Build {titles}",
+        commands=[compile_script],
+        _env=env,
+        _if=list(built),
+        _ignore_errors=True,
+    )
+    built.append(compiled.did_succeed)
+
+    if use_ccache:
+        python.call(
+            name="Show ccache statistics",
+            function=_log_ccache_stats,
+            env=env,
+            _if=list(built),
+        )
+
+    installed: list[Callable[[], bool]] = []
+    for build, artifact, stamp in pending:
+        build_dir = f"{work_dir}/build/{build.directory}"
+        stage_dir = f"{work_dir}/stage/{build.directory}"
+
+        install = server.shell(
+            name=f"Cache and install {build.title}",
+            commands=[
+                f"rm -rf {stage_dir}",
+                stage_command(build, build_dir, stage_dir),
+                *pack_artifact_commands(stage_dir, artifact),
+                *unpack_artifact_commands(artifact),
+            ],
+            _if=list(built),
+            _ignore_errors=True,
+        )
+        _record_stamp(build, stamp, [*built, install.did_succeed])
+        installed.append(install.did_succeed)
+
+    if tmpfs_mb:
+        # Reached after a failed build too; logs stay on disk
+        server.shell(
+            name="Unmount tmpfs build directory",
+            commands=[f"! mountpoint -q {BUILD_TMPFS_DIR} || umount {BUILD_TMPFS_DIR}"],
+        )
+
+    python.raise_exception(
+        RuntimeError,
+        f"Building {titles} failed, see the errors above",
+        name=f"Check {titles} build",
+        _if=lambda: not all(did_succeed() for did_succeed in [*built, *installed]),
+    )
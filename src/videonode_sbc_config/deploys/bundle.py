@@ -0,0 +1,90 @@
+"""
+Unpack a provisioning bundle (see videonode_sbc_config.bundle) on the target.
+
+`videonode-sbc-config setup --from-bundle` runs this first and then
+deploys/setup.py with the unpacked artifact cache and package directory,
+so provisioning needs no compiling or network access. A bundle that is
+already unpacked is not uploaded again; one built for another
+architecture, SBC family or SoC is refused.
+
+Usage:
+    pyinfra @local deploys/bundle.py --sudo --data bundle=rk3588.tar
+"""
+
+import json
+from pathlib import Path
+
+from pyinfra import logger
+from pyinfra.context import host
+from pyinfra.facts.files import FileContents
+from pyinfra.facts.server import Arch, Command
+from pyinfra.operations import files, python, server
+
+from videonode_sbc_config.bundle import TARGET_BUNDLE_DIR, read_manifest
+from videonode_sbc_config.platform import (
+    DETECTION_SOURCES,
+    Platform,
+    platform_from_sources,
+)
+
+
+def get_target_platform() -> Platform:
+    """Detect the platform of the current host from its detection files."""
+    sources = {}
+    for path in DETECTION_SOURCES:
+        lines = host.get_fact(FileContents, path=path)
+        sources[path] = "\n".join(lines).strip() if lines is not None else None
+    return platform_from_sources(sources)
+
+
+bundle = Path(host.data.get("bundle") or "")
+manifest = read_manifest(bundle)
+archive = f"{TARGET_BUNDLE_DIR}.tar"
+
+installed = host.get_fact(
+    Command, command=f"cat {TARGET_BUNDLE_DIR}/manifest.json 2>/dev/null || true"
+)
+try:
+    installed_files = json.loads(installed or "{}").get("files")
+except ValueError:
+    installed_files = None
+
+arch = host.get_fact(Arch)
+bundle_platform = Platform.from_dict(manifest["platform"])
+target_platform = get_target_platform()
+if arch != manifest["arch"]:
+    python.raise_exception(
+        ValueError,
+        f"Bundle is for {manifest['arch']}, host is {arch}",
+        name="Check bundle architecture",
+    )
+elif (bundle_platform.sbc_family, bundle_platform.sbc_model) != (
+    target_platform.sbc_family,
+    target_platform.sbc_model,
+):
+    python.raise_exception(
+        ValueError,
+        f"Bundle is for {bundle_platform}, host is {target_platform}",
+        name="Check bundle platform",
+    )
+elif installed_files == manifest["files"]:
+    logger.info(f"Bundle {bundle.name} already unpacked")
+else:
+    upload = files.put(
+        name=f"Upload bundle {bundle.name}",
+        src=str(bundle),
+        dest=archive,
+        create_remote_dir=True,
+    )
+    server.shell(
+        name="Unpack bundle",
+        commands=[
+            f"rm -rf {TARGET_BUNDLE_DIR}.new",
+            f"mkdir -p {TARGET_BUNDLE_DIR}.new",
+            f"tar -xf {archive} -C {TARGET_BUNDLE_DIR}.new",
+            f"rm -rf {TARGET_BUNDLE_DIR}",
+            f"mv {TARGET_BUNDLE_DIR}.new {TARGET_BUNDLE_DIR}",
+            f"rm -f {archive}",
+        ],
+        _if=upload.did_succeed,
+    )
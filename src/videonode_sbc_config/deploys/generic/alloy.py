@@ -20,7 +20,10 @@ from pyinfra.facts.files import File
 from pyinfra.facts.server import Command, Home
 from pyinfra.operations import files, server
 
+from videonode_sbc_config.deploys.utils import get_download_url
+
 ALLOY_VERSION = "v1.10.1"
+ALLOY_URL = f"https://github.com/grafana/alloy/releases/download/{ALLOY_VERSION}/alloy-linux-arm64.zip"
 BSSID_MAPPINGS_FILE = Path(__file__).parent.parent.parent / "bssid_mappings.alloy"
 
 
@@ -175,7 +178,7 @@ def install_alloy(
 
     download = files.download(
         name="Download Alloy ARM64 binary",
-        src=f"https://github.com/grafana/alloy/releases/download/{ALLOY_VERSION}/alloy-linux-arm64.zip",
+        src=get_download_url(ALLOY_URL),
         dest="/tmp/alloy-linux-arm64.zip",
         _if=lambda: needs_download,
     )
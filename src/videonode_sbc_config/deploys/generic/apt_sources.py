@@ -0,0 +1,132 @@
+"""
+Point apt at a local package cache for fleet or offline provisioning.
+
+    apt_proxy       Caching proxy (apt-cacher-ng style) used for all apt
+                    downloads, e.g. http://10.0.0.2:3142
+    apt_local_repo  Directory on the target holding .deb files (pre-seeded
+                    or mounted over NFS), added as a trusted flat repository.
+                    Its Packages index is regenerated in place when missing
+                    or older than any .deb file in it, so a read-only mount
+                    needs an up-to-date index (e.g. a provisioning bundle's).
+    download_mirror Where files.download artifacts (cockpit-navigator,
+                    Alloy) are fetched from by file name, see
+                    utils.get_download_url(); defaults to apt_local_repo
+                    for the files it holds.
+
+Unset values remove the configuration again, so a node stops depending on
+a cache that is gone.
+
+Usage:
+    pyinfra @local deploys/generic/apt_sources.py --data apt_proxy=http://10.0.0.2:3142
+    pyinfra @local deploys/generic/apt_sources.py --data apt_local_repo=/mnt/debs
+"""
+
+from io import StringIO
+
+from pyinfra.api.deploy import deploy
+from pyinfra.context import host
+from pyinfra.facts.server import Command
+from pyinfra.operations import files, server
+
+PROXY_CONF = "/etc/apt/apt.conf.d/01videonode-sbc-config-proxy"
+LOCAL_REPO_LIST = "/etc/apt/sources.list.d/videonode-sbc-config-local.list"
+LOCAL_REPO_PREFERENCES = "/etc/apt/preferences.d/videonode-sbc-config-local"
+
+
+def local_repo_stale_command(repo_dir: str) -> str:
+    """Print something if the index of repo_dir is missing or out of date."""
+    return (
+        f"if [ ! -f {repo_dir}/Packages ]; then echo missing; else "
+        f"find {repo_dir} -maxdepth 1 -name '*.deb' -newer {repo_dir}/Packages"
+        " | head -n 1; fi"
+    )
+
+
+def local_repo_index_command(repo_dir: str) -> str:
+    """Generate the flat repository index of repo_dir."""
+    # apt-ftparchive (apt-utils) or dpkg-scanpackages (dpkg-dev), whichever
+    # works; each starts a fresh Packages.tmp so a failed first attempt
+    # leaves nothing behind, and a failed run leaves the old index in place
+    return (
+        f"cd {repo_dir} && "
+        "{ apt-ftparchive packages . 2>/dev/null > Packages.tmp"
+        " || dpkg-scanpackages . > Packages.tmp; }"
+        " && mv Packages.tmp Packages"
+    )
+
+
+@deploy("Configure apt sources")
+def configure_apt_sources() -> None:
+    """Configure the apt proxy and local repository from host data."""
+    proxy = host.data.get("apt_proxy")
+    repo_dir = host.data.get("apt_local_repo")
+
+    if proxy:
+        files.put(
+            name="Configure apt proxy",
+            src=StringIO(f'Acquire::http::Proxy "{proxy}";\n'),
+            dest=PROXY_CONF,
+            mode="644",
+        )
+    else:
+        files.file(
+            name="Remove apt proxy",
+            path=PROXY_CONF,
+            present=False,
+        )
+
+    if repo_dir:
+        # Reindexed when .deb files were added since, e.g. on a shared mount
+        index_ops = []
+        if host.get_fact(Command, command=local_repo_stale_command(repo_dir)):
+            index_ops.append(
+                server.shell(
+                    name=f"Index local packages in {repo_dir}",
+                    commands=[local_repo_index_command(repo_dir)],
+                )
+            )
+        indexed = [op.did_succeed for op in index_ops]
+        repo_list = files.put(
+            name="Add local package repository",
+            src=StringIO(f"deb [trusted=yes] file:{repo_dir} ./\n"),
+            dest=LOCAL_REPO_LIST,
+            mode="644",
+            _if=indexed,
+        )
+        # Prefer the local copies over the same versions on the mirrors
+        repo_preferences = files.put(
+            name="Prefer local package repository",
+            src=StringIO("Package: *\nPin: origin \"\"\nPin-Priority: 600\n"),
+            dest=LOCAL_REPO_PREFERENCES,
+            mode="644",
+            _if=indexed,
+        )
+        changed = [
+            repo_list.did_change,
+            repo_preferences.did_change,
+            *(op.did_change for op in index_ops),
+        ]
+    else:
+        repo_list = files.file(
+            name="Remove local package repository",
+            path=LOCAL_REPO_LIST,
+            present=False,
+        )
+        files.file(
+            name="Remove local package repository preferences",
+            path=LOCAL_REPO_PREFERENCES,
+            present=False,
+        )
+        changed = [repo_list.did_change]
+
+    # A later apt.packages(cache_time=...) may consider the index fresh
+    # although it lacks the changed source or the new packages
+    server.shell(
+        name="Refresh apt index for changed sources",
+        commands=["apt-get update"],
+        _if=lambda: any(did_change() for did_change in changed),
+    )
+
+
+if __name__ == "__main__":
+    configure_apt_sources(_sudo=True)
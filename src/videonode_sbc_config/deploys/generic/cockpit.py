@@ -12,29 +12,39 @@ from pyinfra.api.deploy import deploy
 from pyinfra.facts.deb import DebPackage
 from pyinfra.operations import apt, files, server
 
+from videonode_sbc_config.deploys.utils import APT_CACHE_TIME, get_download_url
+
 COCKPIT_PORT = 9890
+COCKPIT_PACKAGES = [
+    "cockpit",
+    "cockpit-ws",
+    "cockpit-system",
+    "cockpit-storaged",
+    "cockpit-networkmanager",
+]
 NAVIGATOR_URL = "https://github.com/45Drives/cockpit-navigator/releases/download/v0.5.10/cockpit-navigator_0.5.10-1focal_all.deb"
 
 
 @deploy("Setup Cockpit")
-def install_cockpit() -> None:
-    """Install Cockpit web console with file manager."""
-    apt_install = apt.packages(
-        name="Install Cockpit packages",
-        packages=[
-            "cockpit",
-            "cockpit-ws",
-            "cockpit-system",
-            "cockpit-storaged",
-            "cockpit-networkmanager",
-        ],
-        update=True,
-    )
+def install_cockpit(install_deps: bool = True) -> None:
+    """Install Cockpit web console with file manager.
+
+    With install_deps=False COCKPIT_PACKAGES must already be installed.
+    """
+    installed = []
+    if install_deps:
+        apt_install = apt.packages(
+            name="Install Cockpit packages",
+            packages=COCKPIT_PACKAGES,
+            update=True,
+            cache_time=APT_CACHE_TIME,
+        )
+        installed.append(apt_install.did_succeed)
 
     files.directory(
         name="Create cockpit socket override directory",
         path="/etc/systemd/system/cockpit.socket.d",
-        _if=apt_install.did_succeed,
+        _if=installed,
     )
 
     socket_override = f"""[Socket]
@@ -47,7 +57,7 @@ ListenStream={COCKPIT_PORT}
         dest="/etc/systemd/system/cockpit.socket.d/override.conf",
         src=StringIO(socket_override),
         mode="644",
-        _if=apt_install.did_succeed,
+        _if=installed,
     )
 
     # Check if navigator already installed and download if needed
@@ -57,7 +67,7 @@ ListenStream={COCKPIT_PORT}
 
     download = files.download(
         name="Download cockpit-navigator deb package",
-        src=NAVIGATOR_URL,
+        src=get_download_url(NAVIGATOR_URL),
         dest="/tmp/cockpit-navigator.deb",
         _if=lambda: not navigator_installed,
     )
@@ -87,7 +97,7 @@ ListenStream={COCKPIT_PORT}
             "systemctl enable cockpit.socket",
             "systemctl restart cockpit.socket",
         ],
-        _if=apt_install.did_succeed,
+        _if=installed,
     )
 
     logger.info(f"Cockpit web console available at https://<host-ip>:{COCKPIT_PORT}")
@@ -4,75 +4,131 @@ Install FFmpeg with Rockchip hardware acceleration using pyinfra.
 Usage:
     pyinfra @local deploys/hardware/rockchip/ffmpeg.py
     pyinfra @local deploys/hardware/rockchip/ffmpeg.py --data rebuild=true
+    pyinfra @local deploys/hardware/rockchip/ffmpeg.py --data artifact_cache=/mnt/nfs/artifacts
+    pyinfra @local deploys/hardware/rockchip/ffmpeg.py --data ffmpeg_profile=rk3588-perf
+
+Profiles:
+    generic      Stock configure flags
+    rk3588-perf  Tuned for Cortex-A76/A55 with -O3 and LTO, no docs/ffplay/debug info
+    size         --enable-small (-Os), no docs/ffplay/debug info
+
+Both tuned profiles only build the codecs in FFMPEG_CODEC_FLAGS. The
+installed profile is recorded in the build stamp and is part of the
+`bench` fingerprint.
 """
 
 from pyinfra.api.deploy import deploy
 from pyinfra.context import host
-from pyinfra.facts.server import Home
-from pyinfra.operations import apt, files, server
+from pyinfra.operations import python
 
-from videonode_sbc_config.deploys.utils import get_build_dependencies, get_parallel_jobs
+from videonode_sbc_config.deploys.build import SourceBuild, install_source_builds
+
+from .versions import FFMPEG_VERSION
 
-FFMPEG_VERSION = "7.1"
 FFMPEG_REPO = "https://github.com/nyanmisaka/ffmpeg-rockchip.git"
+FFMPEG_CONFIGURE_FLAGS = [
+    "--prefix=/usr",
+    "--enable-gpl",
+    "--enable-version3",
+    "--enable-libdrm",
+    "--enable-rkmpp",
+    "--enable-rkrga",
+    "--enable-libopus",
+    "--enable-libfreetype",
+    "--enable-libharfbuzz",
+    "--enable-libfontconfig",
+    "--enable-libsrt",
+]
 
+# Components the video node does not use
+FFMPEG_TRIM_FLAGS = [
+    "--disable-doc",
+    "--disable-ffplay",
+    "--disable-debug",
+]
 
-@deploy("Install FFmpeg")
-def install_ffmpeg(rebuild: bool = False) -> None:
-    """Install FFmpeg with Rockchip hardware acceleration."""
-    user_home = host.get_fact(Home)
-    build_base = f"{user_home}/dev"
-    build_dir = f"{build_base}/ffmpeg"
-    parallel_jobs = get_parallel_jobs()
-
-    deps = apt.packages(
-        name="Install FFmpeg build dependencies",
-        packages=get_build_dependencies("base", "ffmpeg"),
-        update=True,
-    )
+# Codec allow-list: Rockchip MPP hardware codecs, software decoders for
+# camera input, and the audio codecs of the Opus/AAC paths. Muxers,
+# demuxers, parsers and bitstream filters stay enabled for stream copy.
+FFMPEG_CODEC_FLAGS = [
+    "--disable-decoders",
+    "--disable-encoders",
+    "--enable-decoder=h264_rkmpp,hevc_rkmpp,vp8_rkmpp,vp9_rkmpp,av1_rkmpp",
+    "--enable-decoder=h264,hevc,mjpeg,rawvideo",
+    "--enable-decoder=libopus,opus,aac,pcm_s16le",
+    "--enable-encoder=h264_rkmpp,hevc_rkmpp,mjpeg_rkmpp",
+    "--enable-encoder=rawvideo,wrapped_avframe",
+    "--enable-encoder=libopus,aac,pcm_s16le",
+]
 
-    files.directory(
-        name="Create FFmpeg build directory",
-        path=build_base,
-        _if=deps.did_succeed,
-    )
+# Extra configure flags per build profile, appended to FFMPEG_CONFIGURE_FLAGS
+FFMPEG_PROFILES: dict[str, list[str]] = {
+    "generic": [],
+    "rk3588-perf": [
+        "--extra-cflags='-mcpu=cortex-a76.cortex-a55 -O3'",
+        "--enable-lto",
+        *FFMPEG_TRIM_FLAGS,
+        *FFMPEG_CODEC_FLAGS,
+    ],
+    "size": [
+        "--enable-small",
+        *FFMPEG_TRIM_FLAGS,
+        *FFMPEG_CODEC_FLAGS,
+    ],
+}
+DEFAULT_FFMPEG_PROFILE = "generic"
 
-    files.directory(
-        name="Remove existing FFmpeg directory if present",
-        path=build_dir,
-        present=False,
-        _if=deps.did_succeed,
-    )
 
-    clone = server.shell(
-        name="Clone FFmpeg Rockchip repository",
-        commands=[
-            f"git clone --depth 1 --branch {FFMPEG_VERSION} {FFMPEG_REPO} {build_dir}"
-        ],
-        _if=deps.did_succeed,
-        _retries=2,  # type: ignore[call-arg]
-        _retry_delay=5,  # type: ignore[call-arg]
-    )
+def get_ffmpeg_build(profile: str = DEFAULT_FFMPEG_PROFILE) -> SourceBuild | None:
+    """Get the FFmpeg build for a profile, or None if the profile is unknown.
 
-    configure = server.shell(
-        name="Configure FFmpeg with Rockchip support",
-        commands=[
-            f"cd {build_dir} && ./configure --prefix=/usr --enable-gpl --enable-version3 --enable-libdrm --enable-rkmpp --enable-rkrga --enable-libopus --enable-libfreetype --enable-libharfbuzz --enable-libfontconfig --enable-libsrt"
-        ],
-        _if=clone.did_succeed,
+    Profile flags are part of the build flags, so each profile has its own
+    artifact key and switching profiles triggers a rebuild.
+    """
+    if profile not in FFMPEG_PROFILES:
+        return None
+    return SourceBuild(
+        project="ffmpeg",
+        title="FFmpeg",
+        repo=FFMPEG_REPO,
+        ref=FFMPEG_VERSION,
+        build_system="configure",
+        flags=(*FFMPEG_CONFIGURE_FLAGS, *FFMPEG_PROFILES[profile]),
+        directory="ffmpeg",
+        profile=profile,
     )
 
-    build = server.shell(
-        name="Build FFmpeg",
-        commands=[f"cd {build_dir} && make -j{parallel_jobs}"],
-        _if=configure.did_succeed,
-    )
 
-    server.shell(
-        name="Install FFmpeg",
-        commands=[f"cd {build_dir} && make install", "ldconfig"],
-        _if=build.did_succeed,
-    )
+def get_ffmpeg_profile(profile: str | None = None) -> str:
+    """Resolve the profile: argument, then --data ffmpeg_profile, then "generic".
+
+    Raises ValueError if the profile is unknown.
+    """
+    profile = profile or host.data.get("ffmpeg_profile") or DEFAULT_FFMPEG_PROFILE
+    if profile not in FFMPEG_PROFILES:
+        raise ValueError(
+            f"Unknown FFmpeg profile: {profile} "
+            f"(available: {', '.join(FFMPEG_PROFILES)})"
+        )
+    return profile
+
+
+@deploy("Install FFmpeg")
+def install_ffmpeg(
+    rebuild: bool = False, profile: str | None = None, install_deps: bool = True
+) -> None:
+    """Install FFmpeg with Rockchip hardware acceleration.
+
+    profile defaults to --data ffmpeg_profile, then "generic".
+    """
+    try:
+        build = get_ffmpeg_build(get_ffmpeg_profile(profile))
+    except ValueError as e:
+        # Fails the host instead of finishing the stack without FFmpeg
+        python.raise_exception(ValueError, str(e), name="Check FFmpeg profile")
+        return
+    if build:
+        install_source_builds([build], rebuild=rebuild, install_deps=install_deps)
 
 
 if __name__ == "__main__":
@@ -1,27 +1,52 @@
 """
 Install the complete Rockchip video stack (MPP, RGA, FFmpeg) using pyinfra.
 
+MPP and RGA do not depend on each other (RGA is built with -Dlibdrm=false)
+and compile concurrently; FFmpeg links against both and is built after.
+
+get_stack_packages() lists the build dependencies still needed, for
+callers that install them up front and pass install_deps=False.
+
 Usage:
     pyinfra @local deploys/hardware/rockchip/stack.py
     pyinfra @local deploys/hardware/rockchip/stack.py --data rebuild=true
+    pyinfra @local deploys/hardware/rockchip/stack.py --data ffmpeg_profile=rk3588-perf
 """
 
 from pyinfra.api.deploy import deploy
 from pyinfra.context import host
 
-from .ffmpeg import install_ffmpeg
-from .mpp import install_mpp
+from videonode_sbc_config.deploys.build import (
+    get_build_packages,
+    install_source_builds,
+)
+
+from .ffmpeg import get_ffmpeg_build, get_ffmpeg_profile, install_ffmpeg
+from .mpp import MPP_BUILD
 from .permissions import setup_permissions
-from .rga import install_rga
+from .rga import RGA_BUILD
+
+
+def get_stack_packages(rebuild: bool = False) -> list[str]:
+    """Get the apt packages needed to build the parts of the stack not installed."""
+    builds = [MPP_BUILD, RGA_BUILD]
+    try:
+        ffmpeg_build = get_ffmpeg_build(get_ffmpeg_profile())
+    except ValueError:
+        ffmpeg_build = None  # install_ffmpeg() fails the host
+    if ffmpeg_build:
+        builds.append(ffmpeg_build)
+    return get_build_packages(builds, rebuild)
 
 
 @deploy("Install Rockchip Video Stack")
-def install_rockchip_stack(rebuild: bool = False) -> None:
+def install_rockchip_stack(rebuild: bool = False, install_deps: bool = True) -> None:
     """Install the complete Rockchip video stack with hardware acceleration."""
     setup_permissions()
-    mpp = install_mpp(rebuild=rebuild)
-    rga = install_rga(rebuild=rebuild, _if=mpp.did_succeed)
-    install_ffmpeg(rebuild=rebuild, _if=rga.did_succeed)
+    install_source_builds(
+        [MPP_BUILD, RGA_BUILD], rebuild=rebuild, install_deps=install_deps
+    )
+    install_ffmpeg(rebuild=rebuild, install_deps=install_deps)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,9 @@
+"""Versions of the source-built Rockchip stack.
+
+Kept free of pyinfra imports so the CLI (e.g. bench baselines) can read
+them without loading the deploy machinery.
+"""
+
+MPP_VERSION = "1.0.10"
+RGA_BRANCH = "jellyfin-rga"
+FFMPEG_VERSION = "7.1"
@@ -1,81 +1,128 @@
 """
 Manage kernel overlays for Armbian systems.
 
-This module uses armbian-add-overlay to apply device tree overlays.
-The overlay content is defined in hardware/<soc>/overlays.py.
+Overlays are installed as precompiled .dtbo files into /boot/overlay-user
+(see deploys/overlay_cache.py) and enabled with a single user_overlays
+update in armbianEnv.txt, however many are selected. The overlay content
+is defined in hardware/<soc>/overlays.py.
+
+With overlay_cache set (a directory on the target holding cache files,
+such as an unpacked provisioning bundle), overlays found there are
+installed from it and nothing is uploaded.
 
 Usage:
-    pyinfra @local deploys/os/armbian/kernel_overlays.py --data overlay_id=usb-host-mode
+    pyinfra @local deploys/setup.py --sudo --data components=overlays \
+        --data overlay_ids=usb-host-mode,disable-hdmirx
 """
 
-from io import StringIO
+import subprocess
+from collections.abc import Sequence
 
 from pyinfra import logger
 from pyinfra.api.deploy import deploy
 from pyinfra.context import host
-from pyinfra.facts.files import File
-from pyinfra.operations import files, server
+from pyinfra.facts.files import File, FindInFile, Sha1File
+from pyinfra.operations import files, python, server
 
-from videonode_sbc_config.deploys.hardware.rockchip.overlays import get_overlay
+from videonode_sbc_config.deploys.hardware.rockchip.overlays import (
+    Overlay,
+    get_overlay,
+)
+from videonode_sbc_config.deploys.overlay_cache import get_cached_overlay, get_dtbo_name
 
-ARMBIAN_ADD_OVERLAY = "/usr/sbin/armbian-add-overlay"
 ARMBIAN_ENV_TXT = "/boot/armbianEnv.txt"
+OVERLAY_USER_DIR = "/boot/overlay-user"
+
+
+def get_selected_overlays() -> list[Overlay]:
+    """Get the overlays named by overlay_ids (or overlay_id) in host data."""
+    selected = host.data.get("overlay_ids") or host.data.get("overlay_id") or []
+    if isinstance(selected, str):
+        selected = selected.split(",")
+
+    overlays = []
+    for overlay_id in selected:
+        overlay = get_overlay(overlay_id.strip())
+        if not overlay:
+            logger.error(f"Unknown overlay: {overlay_id}")
+        elif overlay not in overlays:
+            overlays.append(overlay)
+    if not selected:
+        logger.error("No overlays selected. Use --data overlay_ids=<id>,<id>")
+    return overlays
+
+
+def merge_user_overlays(line: str | None, overlay_ids: Sequence[str]) -> str:
+    """Get the user_overlays line enabling overlay_ids on top of line.
+
+    Overlays enabled before are kept first, and each id appears once.
+    """
+    enabled = line.partition("=")[2].split() if line else []
+    return f"user_overlays={' '.join(dict.fromkeys([*enabled, *overlay_ids]))}"
+
+
+def _install_from_target_cache(overlay: Overlay, cache_dir: str) -> bool:
+    """Install an overlay from a cache on the target, False if it is not there."""
+    src = f"{cache_dir}/{get_dtbo_name(overlay)}"
+    if not host.get_fact(File, path=src):
+        return False
+    dest = f"{OVERLAY_USER_DIR}/{overlay.id}.dtbo"
+    if host.get_fact(Sha1File, path=src) != host.get_fact(Sha1File, path=dest):
+        server.shell(
+            name=f"Install {overlay.id} overlay",
+            commands=[f"install -D -m 644 {src} {dest}"],
+        )
+    return True
 
 
-@deploy("Apply kernel overlay")
-def apply_overlay(overlay_id: str, dts_content: str) -> None:
-    """Apply a device tree overlay using armbian-add-overlay."""
-    dts_path = f"/tmp/{overlay_id}.dts"
-
-    put_dts = files.put(
-        name=f"Create {overlay_id} overlay",
-        src=StringIO(dts_content),
-        dest=dts_path,
-        mode="644",
-    )
-
-    apply_cmd = server.shell(
-        name=f"Apply {overlay_id} overlay with armbian-add-overlay",
-        commands=[f"armbian-add-overlay {dts_path}"],
-        _if=put_dts.did_succeed,
-    )
+@deploy("Apply kernel overlays")
+def apply_overlays(overlays: list[Overlay]) -> None:
+    """Install compiled overlays and enable them at boot."""
+    if not overlays:
+        return
 
-    server.shell(
-        name=f"Enable {overlay_id} overlay at boot",
-        commands=[
-            f"grep -q '^user_overlays=' {ARMBIAN_ENV_TXT} && sed -i '/^user_overlays=/s/$/ {overlay_id}/' {ARMBIAN_ENV_TXT} || echo 'user_overlays={overlay_id}' >> {ARMBIAN_ENV_TXT}",
-            f"sed -i 's/user_overlays=\\s*/user_overlays=/' {ARMBIAN_ENV_TXT}",
-        ],
-        _if=apply_cmd.did_succeed,
-    )
+    current = host.get_fact(FindInFile, path=ARMBIAN_ENV_TXT, pattern="^user_overlays=")
+    if current is None:
+        python.raise_exception(
+            OSError,
+            f"{ARMBIAN_ENV_TXT} not found, overlays need an Armbian system",
+            name="Check armbianEnv.txt",
+        )
+        return
+
+    target_cache = host.data.get("overlay_cache")
+    for overlay in overlays:
+        if target_cache and _install_from_target_cache(overlay, target_cache):
+            continue
+        try:
+            dtbo = get_cached_overlay(overlay)
+        except (OSError, subprocess.CalledProcessError) as e:
+            python.raise_exception(
+                OSError,
+                f"Cannot compile {overlay.id} overlay: {e}",
+                name=f"Compile {overlay.id} overlay",
+            )
+            return
+        # Compares checksums, so an unchanged overlay is not uploaded again
+        files.put(
+            name=f"Install {overlay.id} overlay",
+            src=str(dtbo),
+            dest=f"{OVERLAY_USER_DIR}/{overlay.id}.dtbo",
+            mode="644",
+            create_remote_dir=True,
+        )
 
-    files.file(
-        name=f"Clean up {overlay_id} overlay source",
-        path=dts_path,
-        present=False,
+    # One line for all overlays, keeping the ones enabled before
+    files.line(
+        name="Enable overlays at boot",
+        path=ARMBIAN_ENV_TXT,
+        line="^user_overlays=.*",
+        replace=merge_user_overlays(
+            current[0] if current else None, [o.id for o in overlays]
+        ),
     )
 
 
 if __name__ == "__main__":
-    has_armbian_overlay = host.get_fact(File, ARMBIAN_ADD_OVERLAY)
-
-    if not has_armbian_overlay:
-        logger.error(
-            f"{ARMBIAN_ADD_OVERLAY} not found. This tool comes with Armbian by default."
-        )
-        exit(1)
-
-    overlay_id: str = host.data.get("overlay_id") or ""
-
-    if not overlay_id:
-        logger.error("No overlay_id specified. Use --data overlay_id=<id>")
-        exit(1)
-
-    overlay = get_overlay(overlay_id)
-    if not overlay:
-        logger.error(f"Unknown overlay: {overlay_id}")
-        exit(1)
-
-    logger.info(f"Installing overlay: {overlay.name}")
-    apply_overlay(overlay_id=overlay.id, dts_content=overlay.dts, _sudo=True)
+    apply_overlays(get_selected_overlays(), _sudo=True)
     logger.info("Reboot required for overlay changes to take effect")
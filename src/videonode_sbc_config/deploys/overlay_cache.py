@@ -0,0 +1,60 @@
+"""
+Compiled device tree overlay cache.
+
+Overlay sources are compiled to .dtbo on the machine running the deploy,
+once per source content, and the binaries are uploaded to the targets, so
+nodes need no dtc and no per-node compile. Cache files are named
+<overlay id>-<content hash>.dtbo; a changed source gets a new file.
+Provisioning bundles carry the same files (see videonode_sbc_config.bundle).
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+from videonode_sbc_config.deploys.hardware.rockchip.overlays import Overlay
+
+CACHE_DIR = "videonode-sbc-config/overlays"
+HASH_LENGTH = 16
+
+
+def get_cache_dir() -> Path:
+    """Get the overlay cache directory under $XDG_CACHE_HOME."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / CACHE_DIR
+
+
+def get_dtbo_name(overlay: Overlay) -> str:
+    """Cache file name of an overlay, keyed by its source content."""
+    digest = hashlib.sha256(overlay.dts.encode()).hexdigest()[:HASH_LENGTH]
+    return f"{overlay.id}-{digest}.dtbo"
+
+
+def compile_overlay(dts: str, output: Path) -> None:
+    """Compile an overlay source to .dtbo with dtc."""
+    if not shutil.which("dtc"):
+        raise OSError("dtc not found (apt install device-tree-compiler)")
+    subprocess.run(
+        ["dtc", "-@", "-q", "-I", "dts", "-O", "dtb", "-o", str(output), "-"],
+        input=dts,
+        text=True,
+        check=True,
+    )
+
+
+def get_cached_overlay(overlay: Overlay, cache_dir: Path | None = None) -> Path:
+    """Get the compiled overlay, compiling it on a cache miss.
+
+    Raises OSError if dtc is missing and CalledProcessError if it fails.
+    """
+    cache_dir = cache_dir or get_cache_dir()
+    path = cache_dir / get_dtbo_name(overlay)
+    if not path.is_file():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Written aside so a failed compile leaves no partial cache entry
+        partial = path.with_name(path.name + ".tmp")
+        compile_overlay(overlay.dts, partial)
+        partial.replace(path)
+    return path
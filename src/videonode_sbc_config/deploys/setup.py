@@ -0,0 +1,97 @@
+"""
+Set up a node with the selected components (default: the Rockchip stack).
+
+Deploy file for running against an inventory; `videonode-sbc-config setup`
+wraps it.
+
+Usage:
+    pyinfra @local deploys/setup.py --sudo
+    pyinfra inventory.py deploys/setup.py --sudo --parallel 10
+    pyinfra node1,node2 deploys/setup.py --sudo --data components=stack,cockpit
+    pyinfra @local deploys/setup.py --sudo --data deploy_trace=/tmp/trace.json
+    pyinfra @local deploys/setup.py --sudo --data components=overlays \
+        --data overlay_ids=usb-host-mode,disable-hdmirx
+
+With apt_proxy or apt_local_repo set, apt is pointed at the local cache
+first (see deploys/generic/apt_sources.py).
+
+Apt packages of all selected components are planned first and installed
+in one transaction with at most one index refresh (skipped while the apt
+lists are fresh); the component deploys then skip their own apt steps.
+
+Every operation is timed; the per-phase breakdown is logged at the end and
+deploy_trace names an optional Chrome trace-event output file.
+"""
+
+from collections.abc import Callable
+from functools import partial
+
+from pyinfra import logger
+from pyinfra.context import host
+from pyinfra.operations import apt
+
+from videonode_sbc_config.deploys.generic.apt_sources import configure_apt_sources
+from videonode_sbc_config.deploys.generic.cockpit import (
+    COCKPIT_PACKAGES,
+    install_cockpit,
+)
+from videonode_sbc_config.deploys.generic.led_permissions import (
+    setup_led_permissions,
+)
+from videonode_sbc_config.deploys.hardware.rockchip.permissions import (
+    setup_permissions,
+)
+from videonode_sbc_config.deploys.hardware.rockchip.stack import (
+    get_stack_packages,
+    install_rockchip_stack,
+)
+from videonode_sbc_config.deploys.os.armbian.kernel_overlays import (
+    apply_overlays,
+    get_selected_overlays,
+)
+from videonode_sbc_config.deploys.os.armbian.led_disable import disable_leds
+from videonode_sbc_config.deploys.timing import enable_deploy_timing
+from videonode_sbc_config.deploys.utils import APT_CACHE_TIME
+
+# Deploys taking install_deps get False: their packages come from PACKAGES
+COMPONENTS: dict[str, list[Callable[[], None]]] = {
+    "stack": [partial(install_rockchip_stack, install_deps=False)],
+    "permissions": [setup_permissions],
+    "leds": [setup_led_permissions, disable_leds],
+    "cockpit": [partial(install_cockpit, install_deps=False)],
+    "overlays": [lambda: apply_overlays(get_selected_overlays())],
+}
+PACKAGES: dict[str, Callable[[], list[str]]] = {
+    "stack": get_stack_packages,
+    "cockpit": lambda: COCKPIT_PACKAGES,
+}
+DEFAULT_COMPONENTS = "stack"
+
+enable_deploy_timing(host.data.get("deploy_trace"))
+
+selected = host.data.get("components") or DEFAULT_COMPONENTS
+if isinstance(selected, str):
+    selected = selected.split(",")
+
+names = []
+for name in selected:
+    name = name.strip()
+    if name not in COMPONENTS:
+        logger.error(f"Unknown component: {name}")
+        continue
+    names.append(name)
+
+configure_apt_sources()
+
+packages = sorted({pkg for name in names for pkg in PACKAGES.get(name, list)()})
+if packages:
+    apt.packages(
+        name="Install packages for all components",
+        packages=packages,
+        update=True,
+        cache_time=APT_CACHE_TIME,
+    )
+
+for name in names:
+    for deploy_fn in COMPONENTS[name]:
+        deploy_fn()
@@ -0,0 +1,190 @@
+"""
+Operation timing for deploy runs.
+
+enable_deploy_timing() hooks a callback handler into the running pyinfra
+state that records the wall time of every operation on every host. When
+pyinfra exits it logs a per-phase breakdown and, if asked to, writes the
+spans as a Chrome trace-event file (open in chrome://tracing or Perfetto).
+
+Usage from a deploy file:
+    enable_deploy_timing(host.data.get("deploy_trace"))
+"""
+
+import atexit
+import json
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+from pyinfra import logger
+from pyinfra.api import State
+from pyinfra.api.host import Host
+from pyinfra.api.state import BaseStateCallback
+from pyinfra.context import state as current_state
+
+# Phases by operation name, first match wins. Deploys name their
+# operations consistently ("Check out X", "Configure X", "Build X", ...)
+APT_KEYWORDS = ("dependencies", "packages", "package repository", "apt ")
+PHASE_PREFIXES = (
+    ("checkout", ("Check out", "Clone")),
+    ("configure", ("Configure",)),
+    ("build", ("Build",)),
+    ("install", ("Cache and install", "Install", "Record installed")),
+    ("udev", ("Reload udev",)),
+    ("download", ("Download",)),
+)
+DEFAULT_PHASE = "other"
+SLOWEST_LIMIT = 5  # Operations listed after the phase breakdown
+
+
+@dataclass
+class OperationSpan:
+    """Wall time of one operation on one host (seconds since timing began)."""
+
+    host: str
+    name: str
+    deploy: str  # Enclosing @deploy names, "" at top level
+    start: float
+    end: float = 0.0
+    success: bool = True
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    @property
+    def phase(self) -> str:
+        return get_phase(self.name)
+
+
+def get_phase(name: str) -> str:
+    """Classify an operation by its name."""
+    if any(word in name for word in APT_KEYWORDS):
+        return "apt"
+    for phase, prefixes in PHASE_PREFIXES:
+        if name.startswith(prefixes):
+            return phase
+    return DEFAULT_PHASE
+
+
+def _split_name(state: State, op_hash: str) -> tuple[str, str]:
+    # Inside a @deploy pyinfra names operations "Deploy | Operation"
+    full_name = sorted(state.get_op_meta(op_hash).names)[0]
+    deploy, _, name = full_name.rpartition(" | ")
+    return deploy, name
+
+
+class OperationTimer(BaseStateCallback):
+    """Record an OperationSpan per operation and host."""
+
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.spans: list[OperationSpan] = []
+        self._running: dict[tuple[str, str], OperationSpan] = {}
+
+    def _now(self) -> float:
+        return time.perf_counter() - self.origin
+
+    def operation_host_start(self, state: State, host: Host, op_hash) -> None:
+        deploy, name = _split_name(state, op_hash)
+        span = OperationSpan(host.name, name, deploy, self._now())
+        self._running[(host.name, op_hash)] = span
+        self.spans.append(span)
+
+    def _finish(self, host: Host, op_hash, success: bool) -> None:
+        span = self._running.pop((host.name, op_hash), None)
+        if span is not None:
+            span.end = self._now()
+            span.success = success
+
+    def operation_host_success(
+        self, state: State, host: Host, op_hash, retry_count: int = 0
+    ) -> None:
+        self._finish(host, op_hash, True)
+
+    def operation_host_error(
+        self,
+        state: State,
+        host: Host,
+        op_hash,
+        retry_count: int = 0,
+        max_retries: int = 0,
+    ) -> None:
+        self._finish(host, op_hash, False)
+
+    def finished_spans(self) -> list[OperationSpan]:
+        return [s for s in self.spans if s.end]
+
+
+def phase_breakdown(spans: list[OperationSpan]) -> dict[str, tuple[float, int]]:
+    """Total seconds and operation count per phase, slowest phase first."""
+    totals: dict[str, list] = defaultdict(lambda: [0.0, 0])
+    for span in spans:
+        totals[span.phase][0] += span.duration
+        totals[span.phase][1] += 1
+    ordered = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)
+    return {phase: (seconds, count) for phase, (seconds, count) in ordered}
+
+
+def to_chrome_trace(spans: list[OperationSpan]) -> dict:
+    """Trace-event document with one process per host."""
+    pids = {host: i for i, host in enumerate(dict.fromkeys(s.host for s in spans), 1)}
+    events = [
+        {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": host}}
+        for host, pid in pids.items()
+    ]
+    for span in spans:
+        events.append(
+            {
+                "name": span.name,
+                "cat": span.phase,
+                "ph": "X",
+                "ts": round(span.start * 1e6),
+                "dur": round(span.duration * 1e6),
+                "pid": pids[span.host],
+                "tid": 1,
+                "args": {"deploy": span.deploy, "success": span.success},
+            }
+        )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def log_breakdown(spans: list[OperationSpan]) -> None:
+    if not spans:
+        return
+    total = sum(s.duration for s in spans)
+    logger.info("--> Operation time by phase:")
+    for phase, (seconds, count) in phase_breakdown(spans).items():
+        share = seconds / total * 100 if total else 0.0
+        logger.info(f"    {phase:<10} {seconds:8.1f}s {share:5.1f}%  ({count} ops)")
+    logger.info("--> Slowest operations:")
+    for span in sorted(spans, key=lambda s: s.duration, reverse=True)[:SLOWEST_LIMIT]:
+        logger.info(f"    {span.duration:8.1f}s  [{span.host}] {span.name}")
+
+
+def _report(timer: OperationTimer, trace_path: str | None) -> None:
+    spans = timer.finished_spans()
+    log_breakdown(spans)
+    if trace_path and spans:
+        path = Path(trace_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(to_chrome_trace(spans)))
+        logger.info(f"--> Wrote operation trace to {path}")
+
+
+def enable_deploy_timing(trace_path: str | None = None) -> OperationTimer:
+    """Time the operations of the current pyinfra run (idempotent).
+
+    Deploy files are executed once per host, so the timer is attached to
+    the state on the first call and reused afterwards.
+    """
+    for handler in current_state.callback_handlers:
+        if isinstance(handler, OperationTimer):
+            return handler
+    timer = OperationTimer()
+    current_state.add_callback_handler(timer)
+    # The pyinfra CLI has no end-of-run callback; it exits right after
+    # printing the results
+    atexit.register(_report, timer, trace_path)
+    return timer
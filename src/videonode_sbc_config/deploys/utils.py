@@ -2,16 +2,197 @@
 Shared utilities for pyinfra SBC deployments.
 """
 
+import math
 import os
 
 from pyinfra.api.host import Host
 from pyinfra.api.state import State
+from pyinfra.context import host as current_host
+from pyinfra.facts.files import File
+from pyinfra.facts.server import Command
 from pyinfra.operations import files
 
+# Estimated peak memory per compile job in MB (FFmpeg's link step dominates)
+JOB_MEMORY_MB = {
+    "ffmpeg": 700,
+    "mpp": 350,
+    "rga": 300,
+}
+DEFAULT_JOB_MEMORY_MB = 500
+# Memory left for the OS and a running videonode instance
+MEMORY_RESERVE_MB = 768
+# Estimated build tree size in MB (objects plus staged install)
+BUILD_TREE_MB = {
+    "ffmpeg": 1200,
+    "mpp": 400,
+    "rga": 100,
+}
+DEFAULT_BUILD_TREE_MB = 1000
+
+BUILD_RESOURCES_COMMAND = (
+    "echo cpus $(nproc); "
+    "awk '/^MemAvailable:/ {print \"mem\", $2}' /proc/meminfo; "
+    # cpu.max of the cgroup (v2) the deploy runs in, not of the root cgroup
+    "echo quota $(cat /sys/fs/cgroup$(awk -F: '$1 == 0 {print $3}' "
+    "/proc/self/cgroup)/cpu.max 2>/dev/null); "
+    "echo load $(cut -d' ' -f1 /proc/loadavg)"
+)
+
+
+def compute_parallel_jobs(
+    cpus: int,
+    mem_available_mb: int,
+    job_memory_mb: list[int],
+    cpu_quota: float | None = None,
+    load: float = 0.0,
+    reserve_mb: int = MEMORY_RESERVE_MB,
+) -> int:
+    """Compute jobs per build for builds compiling at the same time.
+
+    job_memory_mb holds the per-job memory estimate of each concurrent
+    build; every build gets the same job count. A memory of 0 means
+    unknown and only CPU limits apply.
+    """
+    builds = max(1, len(job_memory_mb))
+    cpu_jobs = cpus
+    if cpu_quota:
+        cpu_jobs = min(cpu_jobs, math.ceil(cpu_quota))
+    # Leave CPUs that are already busy (e.g. encoding streams) alone
+    cpu_jobs = max(1, cpu_jobs - int(load)) // builds
+    if not mem_available_mb:
+        return max(1, cpu_jobs)
+    round_memory_mb = sum(job_memory_mb) or DEFAULT_JOB_MEMORY_MB
+    mem_jobs = (mem_available_mb - reserve_mb) // round_memory_mb
+    return max(1, min(cpu_jobs, mem_jobs))
+
+
+def use_tmpfs_build(
+    location: str,
+    mem_available_mb: int,
+    tmpfs_mb: int,
+    job_memory_mb: list[int],
+    reserve_mb: int = MEMORY_RESERVE_MB,
+) -> bool:
+    """Decide whether build trees go on tmpfs for a build location setting.
+
+    "auto" uses tmpfs only if the filled tmpfs still leaves room for one
+    compile job of every concurrent build on top of the reserve.
+    """
+    if location == "tmpfs":
+        return True
+    if location != "auto" or not mem_available_mb:
+        return False
+    compile_mb = sum(job_memory_mb) or DEFAULT_JOB_MEMORY_MB
+    return mem_available_mb - reserve_mb - tmpfs_mb >= compile_mb
+
+
+def _parse_build_resources(output: str) -> dict[str, str]:
+    resources = {}
+    for line in output.splitlines():
+        key, _, value = line.partition(" ")
+        resources[key] = value.strip()
+    return resources
+
+
+def get_build_resources() -> dict[str, str]:
+    """Get the target's CPU, memory, quota and load readings."""
+    output = current_host.get_fact(Command, command=BUILD_RESOURCES_COMMAND) or ""
+    return _parse_build_resources(output)
+
+
+def get_tmpfs_build_size(*projects: str) -> int:
+    """Get the tmpfs size in MB for build trees of the given projects.
+
+    Returns 0 when the build_location setting ("auto", "tmpfs" or "disk",
+    default "auto") or the target's free memory puts them on disk.
+    """
+    location = str(current_host.data.get("build_location") or "auto").lower()
+    tmpfs_mb = sum(
+        BUILD_TREE_MB.get(project, DEFAULT_BUILD_TREE_MB) for project in projects
+    )
+    mem_available_mb = int(get_build_resources().get("mem") or 0) // 1024
+    job_memory_mb = [
+        JOB_MEMORY_MB.get(project, DEFAULT_JOB_MEMORY_MB) for project in projects
+    ]
+    if use_tmpfs_build(location, mem_available_mb, tmpfs_mb, job_memory_mb):
+        return tmpfs_mb
+    return 0
+
+
+def get_bool_data(key: str, default: bool = False) -> bool:
+    """Read a boolean --data value ("true", "1", "yes" are truthy)."""
+    value = current_host.data.get(key, default)
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+def get_download_url(url: str) -> str:
+    """Get the URL a files.download artifact is fetched from.
+
+    With --data download_mirror (a URL, or a directory on the target) set,
+    the file of the same name is fetched from there instead, so
+    provisioning works without the upstream server. Without it, the
+    apt_local_repo directory is used when it holds the file. Local
+    directories are read through file:// URLs, which needs curl.
+    """
+    name = url.rsplit("/", 1)[-1]
+    mirror = str(current_host.data.get("download_mirror") or "").rstrip("/")
+    if not mirror:
+        # A package directory only serves the files somebody put there
+        repo_dir = str(current_host.data.get("apt_local_repo") or "").rstrip("/")
+        if not repo_dir or not current_host.get_fact(File, path=f"{repo_dir}/{name}"):
+            return url
+        mirror = repo_dir
+    if mirror.startswith("/"):
+        mirror = f"file://{mirror}"
+    return f"{mirror}/{name}"
+
+
+def get_parallel_jobs(*projects: str, tmpfs_mb: int = 0) -> int:
+    """Get parallel jobs per build for projects compiling concurrently.
+
+    Derived from the target's MemAvailable (minus tmpfs_mb taken by build
+    trees on tmpfs), cgroup CPU quota, load average and the per-job memory
+    estimate of each project; --data build_jobs=N overrides it.
+
+    Raises ValueError if build_jobs is neither a positive integer nor "auto".
+    """
+    override = str(current_host.data.get("build_jobs") or "auto").strip()
+    if override.lower() != "auto":
+        if not override.isdigit() or int(override) < 1:
+            raise ValueError(
+                f"Invalid build_jobs: {override!r} (expected a positive number "
+                "of jobs or auto)"
+            )
+        return int(override)
 
-def get_parallel_jobs() -> int:
-    """Get number of parallel build jobs based on CPU count."""
-    return os.cpu_count() or 4
+    resources = get_build_resources()
+
+    cpu_quota = None
+    quota, _, period = resources.get("quota", "").partition(" ")
+    if quota.isdigit() and period.isdigit():
+        cpu_quota = int(quota) / int(period)
+
+    try:
+        load = float(resources.get("load") or 0)
+    except ValueError:
+        load = 0.0
+
+    mem_available_mb = int(resources.get("mem") or 0) // 1024
+    if mem_available_mb:
+        # Build trees on tmpfs fill up memory as the build runs
+        mem_available_mb = max(1, mem_available_mb - tmpfs_mb)
+
+    return compute_parallel_jobs(
+        cpus=int(resources.get("cpus") or os.cpu_count() or 4),
+        mem_available_mb=mem_available_mb,
+        job_memory_mb=[
+            JOB_MEMORY_MB.get(project, DEFAULT_JOB_MEMORY_MB) for project in projects
+        ],
+        cpu_quota=cpu_quota,
+        load=load,
+    )
 
 
 def ensure_build_dir(state: State, host: Host, path: str) -> None:
@@ -30,6 +211,8 @@ def get_build_dir(base: str = "/root/dev", project: str = "") -> str:
     return base
 
 
+APT_CACHE_TIME = 3600  # Seconds an apt index refresh stays fresh
+
 # Common build dependencies for different projects
 BUILD_DEPS = {
     "base": [
@@ -64,6 +247,26 @@ BUILD_DEPS = {
 }
 
 
+# Libraries the installed builds link against, needed when they are
+# unpacked from the artifact cache instead of compiled. Listed as -dev
+# packages because the runtime package names change between releases
+RUNTIME_DEPS = {
+    "ffmpeg": [
+        "libdrm-dev",
+        "libasound2-dev",
+        "libopus-dev",
+        "libfreetype6-dev",
+        "libharfbuzz-dev",
+        "libfontconfig1-dev",
+        "libsrt-openssl-dev",
+        "libssl-dev",
+    ],
+    "mpp": [
+        "libdrm-dev",
+    ],
+}
+
+
 def get_build_dependencies(*categories: str) -> list[str]:
     """Get combined list of build dependencies for given categories."""
     deps = set()
@@ -71,3 +274,11 @@ def get_build_dependencies(*categories: str) -> list[str]:
         if category in BUILD_DEPS:
             deps.update(BUILD_DEPS[category])
     return sorted(list(deps))
+
+
+def get_runtime_dependencies(*projects: str) -> list[str]:
+    """Get combined list of runtime dependencies for given projects."""
+    deps = set()
+    for project in projects:
+        deps.update(RUNTIME_DEPS.get(project, []))
+    return sorted(deps)
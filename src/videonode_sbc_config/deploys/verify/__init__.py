@@ -1,15 +1,61 @@
 """Platform verification framework."""
 
-from videonode_sbc_config.platform import Platform
+from videonode_sbc_config.platform import OSType, Platform, SBCFamily, SBCModel
 
+from .cache import CheckCache
+from .remote import build_script, parse_script_output, script_command
 from .rockchip_armbian import get_checks as get_rockchip_armbian_checks
-from .types import CheckResult, CheckStatus
+from .runner import run_checks
+from .types import Check, CheckResult, CheckStatus
 
-__all__ = ["CheckResult", "CheckStatus", "run_all_checks"]
+__all__ = [
+    "Check",
+    "CheckCache",
+    "CheckResult",
+    "CheckStatus",
+    "get_remote_check_command",
+    "parse_remote_check_output",
+    "run_all_checks",
+]
 
+# Remote hosts get the suite before their platform is known (one round
+# trip); it is the only supported platform so far
+_REMOTE_SUITE_PLATFORM = Platform(OSType.ARMBIAN, SBCFamily.ROCKCHIP, SBCModel.UNKNOWN)
 
-def run_all_checks(platform: Platform) -> list[CheckResult]:
-    """Run verification checks for detected platform."""
-    if platform.is_rockchip and platform.is_armbian:
-        return get_rockchip_armbian_checks(platform)
+
+def _unsupported(platform: Platform) -> list[CheckResult]:
     return [CheckResult("Platform", CheckStatus.SKIP, f"Unsupported: {platform}")]
+
+
+def run_all_checks(
+    platform: Platform, cache: CheckCache | None = None
+) -> list[CheckResult]:
+    """Run verification checks for detected platform.
+
+    With a cache, only checks whose cached result is stale are re-run.
+    """
+    if platform.is_rockchip and platform.is_armbian:
+        checks = get_rockchip_armbian_checks(platform)
+        return cache.run(checks) if cache else run_checks(checks)
+    return _unsupported(platform)
+
+
+def get_remote_check_command() -> str:
+    """Shell command that runs the check suite on a host in one invocation.
+
+    Only needs python3 on the host; see remote.py.
+    """
+    checks = get_rockchip_armbian_checks(_REMOTE_SUITE_PLATFORM)
+    return script_command(build_script(checks))
+
+
+def parse_remote_check_output(output: str) -> tuple[Platform, list[CheckResult]]:
+    """Detect the platform and evaluate checks from the remote command output.
+
+    Raises ValueError for output that did not come from the command.
+    """
+    checks = get_rockchip_armbian_checks(_REMOTE_SUITE_PLATFORM)
+    platform, results = parse_script_output(checks, output)
+    if platform.is_rockchip and platform.is_armbian:
+        return platform, results
+    return platform, _unsupported(platform)
@@ -0,0 +1,56 @@
+"""Result cache for incremental re-checks."""
+
+import os
+import time
+from collections.abc import Callable, Iterable, Sequence
+
+from .runner import run_checks
+from .types import Check, CheckResult
+
+_Signature = tuple[int | None, ...]
+
+
+def _signature(check: Check) -> _Signature:
+    """Return the mtimes of the files a check depends on."""
+    mtimes: list[int | None] = []
+    for path in check.depends_on:
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+class CheckCache:
+    """Cache check results by name until their TTL expires or they are invalidated.
+
+    A result is also dropped when the mtime of any file listed in the
+    check's depends_on changes.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._entries: dict[str, tuple[float, _Signature, CheckResult]] = {}
+
+    def _is_fresh(self, check: Check, now: float, signature: _Signature) -> bool:
+        entry = self._entries.get(check.name)
+        return (
+            entry is not None and now - entry[0] < check.ttl and entry[1] == signature
+        )
+
+    def run(self, checks: Sequence[Check]) -> list[CheckResult]:
+        """Return results for checks, re-running only stale or missing ones."""
+        now = self._clock()
+        signatures = {c.name: _signature(c) for c in checks}
+        stale = [c for c in checks if not self._is_fresh(c, now, signatures[c.name])]
+        for check, result in zip(stale, run_checks(stale)):
+            self._entries[check.name] = (now, signatures[check.name], result)
+        return [self._entries[c.name][2] for c in checks]
+
+    def invalidate(self, names: Iterable[str] | None = None) -> None:
+        """Drop cached results for the given check names (all if None)."""
+        if names is None:
+            self._entries.clear()
+            return
+        for name in names:
+            self._entries.pop(name, None)
@@ -0,0 +1,148 @@
+"""In-process probes for verification checks.
+
+Probes read sysfs/procfs and stat device nodes directly instead of forking
+shell pipelines. Each probe returns the same string the equivalent shell
+command used to print, so check functions work with either source.
+
+Every probe takes a ``root`` argument so it can run against a fake
+``/sys``, ``/proc`` and ``/dev`` tree. This module only depends on the
+standard library.
+"""
+
+import os
+import re
+import stat
+
+ROOT = "/"
+SECTOR_SIZE = 512
+
+
+def _path(root: str, path: str) -> str:
+    return os.path.join(root, path.lstrip("/"))
+
+
+def read_text(path: str, root: str = ROOT) -> str | None:
+    """Read a (sysfs) file, return None if missing or unreadable."""
+    try:
+        with open(_path(root, path)) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def led_trigger(led: str, root: str = ROOT) -> str:
+    """Return the active trigger of an LED, or "error"."""
+    content = read_text(f"/sys/class/leds/{led}/trigger", root)
+    if content is None:
+        return "error"
+    for trigger in content.split():
+        if trigger.startswith("[") and trigger.endswith("]"):
+            return trigger[1:-1]
+    return "error"
+
+
+def device_mode(path: str, root: str = ROOT) -> str:
+    """Return the `ls -l` style mode string of a device node, or "missing"."""
+    try:
+        return stat.filemode(os.stat(_path(root, path)).st_mode)
+    except OSError:
+        return "missing"
+
+
+def file_installed(path: str, root: str = ROOT) -> str:
+    """Return "Installed" if a regular file exists, else "Not installed"."""
+    return "Installed" if os.path.isfile(_path(root, path)) else "Not installed"
+
+
+def _unescape_mount_path(field: str) -> str:
+    # mountinfo writes space, tab, newline and backslash as octal escapes
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), field)
+
+
+def mount_device(mountpoint: str = "/", root: str = ROOT) -> str | None:
+    """Return the "major:minor" of the device mounted at mountpoint."""
+    content = read_text("/proc/self/mountinfo", root)
+    if content is None:
+        return None
+    device = None
+    for line in content.splitlines():
+        # mount ID, parent ID, major:minor, root, mount point, ...
+        fields = line.split()
+        if len(fields) >= 5 and _unescape_mount_path(fields[4]) == mountpoint:
+            device = fields[2]  # Last match wins (stacked mounts)
+    return device
+
+
+def block_name(devno: str, root: str = ROOT) -> str | None:
+    """Resolve "major:minor" to a kernel block device name (e.g. mmcblk0p2)."""
+    link = _path(root, f"/sys/dev/block/{devno}")
+    if not os.path.exists(link):
+        return None
+    return os.path.basename(os.path.realpath(link))
+
+
+def parent_disk(name: str, root: str = ROOT) -> str:
+    """Return the disk holding a partition (mmcblk0p2 -> mmcblk0)."""
+    sys_path = os.path.realpath(_path(root, f"/sys/class/block/{name}"))
+    if not os.path.exists(os.path.join(sys_path, "partition")):
+        return ""
+    return os.path.basename(os.path.dirname(sys_path))
+
+
+def block_size(name: str, root: str = ROOT) -> int:
+    """Return block device size in bytes (0 if unknown)."""
+    sectors = read_text(f"/sys/class/block/{name}/size", root)
+    return int(sectors) * SECTOR_SIZE if sectors and sectors.isdigit() else 0
+
+
+def _human_size(size: float) -> str:
+    """Format bytes like lsblk (1024-based, e.g. "58.2G")."""
+    for unit in "BKMGT":
+        if size < 1024:
+            break
+        size /= 1024
+    else:
+        unit = "P"
+    return f"{size:.1f}".removesuffix(".0") + unit
+
+
+def boot_disk(root: str = ROOT) -> str:
+    """Return the disk the root filesystem lives on (e.g. mmcblk0)."""
+    devno = mount_device("/", root)
+    name = block_name(devno, root) if devno else None
+    return parent_disk(name, root) if name else ""
+
+
+def disk_size(name: str, root: str = ROOT) -> str:
+    """Return human readable disk size, or "missing"."""
+    size = block_size(name, root)
+    return _human_size(size) if size else "missing"
+
+
+def partition_expansion(root: str = ROOT) -> str:
+    """Return root filesystem size as a percentage of its partition."""
+    devno = mount_device("/", root)
+    name = block_name(devno, root) if devno else None
+    part_size = block_size(name, root) if name else 0
+    try:
+        vfs = os.statvfs(root)
+    except OSError:
+        return "0"
+    fs_size = vfs.f_blocks * vfs.f_frsize
+    if part_size <= 0 or fs_size <= 0:
+        return "0"
+    return str(fs_size * 100 // part_size)
+
+
+def fs_usage(mountpoint: str = "/", root: str = ROOT) -> str:
+    """Return filesystem usage like `df` (e.g. "42%")."""
+    try:
+        vfs = os.statvfs(_path(root, mountpoint))
+    except OSError:
+        return "error"
+    used = (vfs.f_blocks - vfs.f_bfree) * vfs.f_frsize
+    available = vfs.f_bavail * vfs.f_frsize
+    if used + available <= 0:
+        return "0%"
+    # df rounds up
+    return f"{-(-used * 100 // (used + available))}%"
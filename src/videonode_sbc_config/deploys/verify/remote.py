@@ -0,0 +1,157 @@
+"""Run a check suite on another host in a single invocation.
+
+build_script() compiles checks into one standalone Python script: the
+source of the probes module, a JSON list of what to run and a small
+driver. The target only needs python3. The script prints one JSON
+document holding the platform detection sources and one record per check
+(output, exit code, timings); parse_script_output() then evaluates the
+records locally with each check's check_fn, so check logic never has to
+exist on the target and a host costs one round trip however many checks
+there are.
+"""
+
+import base64
+import inspect
+import json
+from collections.abc import Sequence
+from functools import partial
+
+from videonode_sbc_config.platform import (
+    DETECTION_SOURCES,
+    Platform,
+    platform_from_sources,
+)
+
+from . import probes
+from .runner import MAX_WORKERS, evaluate, timeout_result
+from .types import Check, CheckResult
+
+_DRIVER = '''
+import json
+import os
+import signal
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _run_command(command, timeout):
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        ["sh", "-c", command],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        start_new_session=True,
+    )
+    spawn_time = time.perf_counter() - started
+    try:
+        stdout, _ = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        proc.communicate()
+        return "", None, spawn_time
+    return stdout.strip(), proc.returncode, spawn_time
+
+
+def _run(spec):
+    started = time.perf_counter()
+    spawn_time = None
+    if "probe" in spec:
+        try:
+            output = str(globals()[spec["probe"]](*spec["args"], **spec["kwargs"]))
+            exit_code = 0
+        except Exception as e:
+            output, exit_code = str(e), 1
+    else:
+        output, exit_code, spawn_time = _run_command(spec["command"], spec["timeout"])
+    return {
+        "name": spec["name"],
+        "output": output,
+        "exit_code": exit_code,
+        "duration": time.perf_counter() - started,
+        "spawn_time": spawn_time,
+    }
+'''
+
+_MAIN = '''
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+    records = list(pool.map(_run, SPECS))
+print(json.dumps({
+    "sources": {path: read_text(path) for path in SOURCES},
+    "checks": records,
+}))
+'''
+
+
+def _check_spec(check: Check) -> dict:
+    if check.probe is None:
+        return {"name": check.name, "command": check.command, "timeout": check.timeout}
+    probe = check.probe
+    if not isinstance(probe, partial) or probe.func.__module__ != probes.__name__:
+        raise ValueError(f"Probe of check {check.name!r} cannot run remotely")
+    return {
+        "name": check.name,
+        "probe": probe.func.__name__,
+        "args": list(probe.args),
+        "kwargs": probe.keywords,
+    }
+
+
+def build_script(checks: Sequence[Check]) -> str:
+    """Compile checks into a standalone Python script.
+
+    Probes must be functools.partial objects over functions of the probes
+    module (their arguments are serialized as JSON).
+    """
+    specs = [_check_spec(check) for check in checks]
+    return "\n".join(
+        [
+            # Lets the annotated probes run on python3 older than 3.10
+            "from __future__ import annotations",
+            inspect.getsource(probes),
+            _DRIVER,
+            f"MAX_WORKERS = {MAX_WORKERS}",
+            f"SOURCES = {json.dumps(list(DETECTION_SOURCES))}",
+            f"SPECS = json.loads({json.dumps(json.dumps(specs))})",
+            _MAIN,
+        ]
+    )
+
+
+def script_command(script: str) -> str:
+    """Shell command running a script through python3 in one exec."""
+    encoded = base64.b64encode(script.encode()).decode()
+    return f"echo {encoded} | base64 -d | python3 -"
+
+
+def parse_script_output(
+    checks: Sequence[Check], output: str
+) -> tuple[Platform, list[CheckResult]]:
+    """Evaluate the script's JSON output locally, in declaration order.
+
+    Raises ValueError if the output is not the script's JSON document.
+    """
+    try:
+        data = json.loads(output)
+        platform = platform_from_sources(data["sources"])
+        records = {record["name"]: record for record in data["checks"]}
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid check script output: {e}") from e
+
+    results = []
+    for check in checks:
+        record = records.get(check.name)
+        if record is None:
+            results.append(timeout_result(check))
+            continue
+        output = record["output"]
+        if record["exit_code"] is None:
+            result = timeout_result(check)
+        else:
+            result = evaluate(check, output)
+        result.duration = record.get("duration", 0.0)
+        result.spawn_time = record.get("spawn_time")
+        result.output_bytes = len(output.encode())
+        results.append(result)
+    return platform, results
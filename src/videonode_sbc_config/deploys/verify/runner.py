@@ -1,9 +1,86 @@
-"""Subprocess-based check runner."""
+"""Check runner for shell commands and in-process probes."""
 
+import os
+import signal
 import subprocess
-from collections.abc import Callable
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 
-from .types import CheckResult, CheckStatus
+from .types import DEFAULT_TIMEOUT, Check, CheckResult, CheckStatus
+
+MAX_WORKERS = 4
+
+
+def _run_command(command: str, timeout: float) -> tuple[str | None, float]:
+    """Run a shell command.
+
+    Returns its stripped stdout (None on timeout) and the seconds spent
+    spawning the shell.
+    """
+    started = time.perf_counter()
+    # Own session so a timeout can kill the whole pipeline, not just `sh`
+    proc = subprocess.Popen(
+        ["sh", "-c", command],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        start_new_session=True,
+    )
+    spawn_time = time.perf_counter() - started
+    try:
+        stdout, _ = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        proc.communicate()
+        return None, spawn_time
+    return stdout.strip(), spawn_time
+
+
+def evaluate(check: Check, output: str) -> CheckResult:
+    """Turn raw probe/command output into a CheckResult."""
+    if check.check_fn is None:
+        return CheckResult(name=check.name, status=CheckStatus.INFO, message=output)
+
+    passed = check.check_fn(output)
+
+    if passed:
+        msg = check.pass_msg.replace("{result}", output) if check.pass_msg else ""
+    else:
+        msg = check.fail_msg.replace("{result}", output) if check.fail_msg else ""
+
+    return CheckResult(
+        name=check.name,
+        status=CheckStatus.PASS if passed else CheckStatus.FAIL,
+        message=msg,
+        remediation=check.remediation if not passed else None,
+    )
+
+
+def timeout_result(check: Check) -> CheckResult:
+    """Result for a check that produced no output in time."""
+    return CheckResult(
+        name=check.name,
+        status=CheckStatus.TIMEOUT,
+        message=f"No result after {check.timeout:g}s",
+        remediation=check.remediation,
+    )
+
+
+def execute(check: Check) -> CheckResult:
+    """Run a declared check through its probe or shell command, timing it."""
+    started = time.perf_counter()
+    spawn_time = None
+    if check.probe is not None:
+        output: str | None = check.probe()
+    else:
+        output, spawn_time = _run_command(check.command, check.timeout)
+
+    result = timeout_result(check) if output is None else evaluate(check, output)
+    result.duration = time.perf_counter() - started
+    result.spawn_time = spawn_time
+    result.output_bytes = len(output.encode()) if output else 0
+    return result
 
 
 def run_check(
@@ -13,6 +90,7 @@ def run_check(
     pass_msg: str = "",
     fail_msg: str = "",
     remediation: str | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
 ) -> CheckResult:
     """Run a verification check via subprocess.
 
@@ -23,30 +101,31 @@ def run_check(
         pass_msg: Message on pass ("{result}" = use command output)
         fail_msg: Message on fail ("{result}" = use command output)
         remediation: Command/action to fix a failure
+        timeout: Seconds to wait for the command before giving up
 
     Returns:
         CheckResult with check outcome
     """
-    result = subprocess.run(
-        ["sh", "-c", command],
-        capture_output=True,
-        text=True,
+    return execute(
+        Check(name, command, check_fn, pass_msg, fail_msg, remediation, timeout)
     )
-    output = result.stdout.strip()
 
-    if check_fn is None:
-        return CheckResult(name=name, status=CheckStatus.INFO, message=output)
 
-    passed = check_fn(output)
+def run_checks(
+    checks: Sequence[Check], max_workers: int = MAX_WORKERS
+) -> list[CheckResult]:
+    """Run independent checks concurrently on a bounded thread pool.
 
-    if passed:
-        msg = pass_msg.replace("{result}", output) if pass_msg else ""
-    else:
-        msg = fail_msg.replace("{result}", output) if fail_msg else ""
-
-    return CheckResult(
-        name=name,
-        status=CheckStatus.PASS if passed else CheckStatus.FAIL,
-        message=msg,
-        remediation=remediation if not passed else None,
-    )
+    Probes run inline since they never block on a child process; only
+    shell commands are dispatched to the pool. Results are returned in
+    declaration order regardless of completion order.
+    """
+    commands = [c for c in checks if c.probe is None]
+    if not commands:
+        return [execute(c) for c in checks]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(commands))) as pool:
+        pending = {id(c): pool.submit(execute, c) for c in commands}
+        return [
+            pending[id(c)].result() if c.probe is None else execute(c)
+            for c in checks
+        ]
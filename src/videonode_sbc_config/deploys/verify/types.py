@@ -1,8 +1,12 @@
 """Verification check types."""
 
+from collections.abc import Callable
 from dataclasses import dataclass
 from enum import Enum
 
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_TTL = 1.0
+
 
 class CheckStatus(Enum):
     """Status of a verification check."""
@@ -11,6 +15,27 @@ class CheckStatus(Enum):
     FAIL = "fail"
     INFO = "info"
     SKIP = "skip"
+    TIMEOUT = "timeout"
+
+
+@dataclass(frozen=True)
+class Check:
+    """Declaration of a single, independent verification check.
+
+    Output comes from an in-process probe when one is set, otherwise from
+    running command through the shell.
+    """
+
+    name: str
+    command: str = ""
+    check_fn: Callable[[str], bool] | None = None
+    pass_msg: str = ""
+    fail_msg: str = ""
+    remediation: str | None = None
+    timeout: float = DEFAULT_TIMEOUT
+    probe: Callable[[], str] | None = None
+    ttl: float = DEFAULT_TTL  # Seconds a cached result stays valid
+    depends_on: tuple[str, ...] = ()  # Files whose mtime change invalidates
 
 
 @dataclass
@@ -21,3 +46,6 @@ class CheckResult:
     status: CheckStatus
     message: str = ""
     remediation: str | None = None
+    duration: float = 0.0  # Wall time in seconds
+    spawn_time: float | None = None  # Seconds to start the shell (commands only)
+    output_bytes: int = 0  # Size of the probe/command output
@@ -0,0 +1,15 @@
+"""Run status checks and deploys across many hosts."""
+
+from .setup import DEFAULT_SETUP_COMPONENTS, SETUP_COMPONENTS, run_setup
+from .status import get_fleet_status
+from .types import DEFAULT_PARALLEL, LOCAL_INVENTORY, HostStatus
+
+__all__ = [
+    "DEFAULT_PARALLEL",
+    "DEFAULT_SETUP_COMPONENTS",
+    "LOCAL_INVENTORY",
+    "SETUP_COMPONENTS",
+    "HostStatus",
+    "get_fleet_status",
+    "run_setup",
+]
@@ -0,0 +1,101 @@
+"""Run the setup deploy over a pyinfra inventory."""
+
+import subprocess
+from collections.abc import Sequence
+from importlib.resources import files
+from pathlib import Path
+
+from .types import DEFAULT_PARALLEL, LOCAL_INVENTORY
+
+# Component names understood by deploys/setup.py
+SETUP_COMPONENTS = ("stack", "permissions", "leds", "cockpit", "overlays")
+DEFAULT_SETUP_COMPONENTS = ("stack",)
+
+
+def get_setup_command(
+    inventory: str = LOCAL_INVENTORY,
+    components: Sequence[str] = DEFAULT_SETUP_COMPONENTS,
+    parallel: int = DEFAULT_PARALLEL,
+    data: Sequence[str] = (),
+    trace: str | None = None,
+) -> list[str]:
+    """pyinfra command line for deploys/setup.py; data holds key=value pairs.
+
+    trace is a path for the Chrome trace-event file of operation timings.
+    """
+    path = files("videonode_sbc_config.deploys").joinpath("setup.py")
+    cmd = [
+        "pyinfra",
+        inventory,
+        str(path),
+        "--sudo",
+        "-y",
+        "--parallel",
+        str(parallel),
+        "--data",
+        f"components={','.join(components)}",
+    ]
+    for item in data:
+        cmd += ["--data", item]
+    if trace:
+        cmd += ["--data", f"deploy_trace={trace}"]
+    return cmd
+
+
+def get_bundle_command(
+    bundle: Path, inventory: str = LOCAL_INVENTORY, parallel: int = DEFAULT_PARALLEL
+) -> list[str]:
+    """pyinfra command line for deploys/bundle.py (upload and unpack)."""
+    path = files("videonode_sbc_config.deploys").joinpath("bundle.py")
+    return [
+        "pyinfra",
+        inventory,
+        str(path),
+        "--sudo",
+        "-y",
+        "--parallel",
+        str(parallel),
+        "--data",
+        f"bundle={bundle.resolve()}",
+    ]
+
+
+def get_bundle_data(manifest: dict) -> list[str]:
+    """Setup data making deploys/setup.py install from an unpacked bundle."""
+    from videonode_sbc_config.bundle import TARGET_BUNDLE_DIR
+
+    return [
+        f"artifact_cache={TARGET_BUNDLE_DIR}/artifacts",
+        f"apt_local_repo={TARGET_BUNDLE_DIR}/debs",
+        f"overlay_cache={TARGET_BUNDLE_DIR}/overlays",
+        f"ffmpeg_profile={manifest['ffmpeg_profile']}",
+    ]
+
+
+def run_setup(
+    inventory: str = LOCAL_INVENTORY,
+    components: Sequence[str] = DEFAULT_SETUP_COMPONENTS,
+    parallel: int = DEFAULT_PARALLEL,
+    data: Sequence[str] = (),
+    trace: str | None = None,
+    bundle: Path | None = None,
+) -> int:
+    """Run setup on every inventory host, return pyinfra's exit code.
+
+    With a bundle it is unpacked on every host first and setup installs
+    from it; setup does not run if unpacking failed on any host. Raises
+    ValueError if bundle is not a provisioning bundle.
+    """
+    if bundle:
+        from videonode_sbc_config.bundle import read_manifest
+
+        manifest = read_manifest(bundle)
+        returncode = subprocess.run(
+            get_bundle_command(bundle, inventory, parallel)
+        ).returncode
+        if returncode != 0:
+            return returncode
+        # Explicit data is passed last and wins
+        data = [*get_bundle_data(manifest), *data]
+    cmd = get_setup_command(inventory, components, parallel, data, trace)
+    return subprocess.run(cmd).returncode
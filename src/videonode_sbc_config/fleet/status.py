@@ -0,0 +1,66 @@
+"""Run status checks across a pyinfra inventory.
+
+Each host gets a single command over its pyinfra connector (SSH for
+remote hosts): the check suite compiled into one Python script (see
+verify/remote.py), so hosts only need python3. Platform detection and
+check evaluation happen locally on the returned JSON. Hosts are handled
+concurrently on pyinfra's pool, bounded by ``parallel``.
+"""
+
+from videonode_sbc_config.deploys.verify import (
+    get_remote_check_command,
+    parse_remote_check_output,
+)
+
+from .types import DEFAULT_PARALLEL, HostStatus
+
+CONNECT_TIMEOUT = 10
+
+
+def parse_host_output(host: str, output: str) -> HostStatus:
+    """Turn the remote check command output into a HostStatus."""
+    try:
+        platform, results = parse_remote_check_output(output)
+    except ValueError:
+        return HostStatus(host=host, error="Invalid check output")
+    return HostStatus(host=host, platform=platform, results=results)
+
+
+def get_fleet_status(
+    inventory: str, parallel: int = DEFAULT_PARALLEL
+) -> list[HostStatus]:
+    """Run status checks on every inventory host, in inventory order.
+
+    inventory is anything `pyinfra` accepts: an inventory file, a comma
+    separated host list or a connector such as @local.
+    """
+    # pyinfra/gevent are only needed in fleet mode
+    import gevent
+    from pyinfra.api import Config, State
+    from pyinfra.api.connect import connect_all, disconnect_all
+    from pyinfra_cli.inventory import make_inventory
+
+    hosts = make_inventory(inventory)
+    state = State(hosts, Config(PARALLEL=parallel, CONNECT_TIMEOUT=CONNECT_TIMEOUT))
+    connect_all(state)
+
+    command = get_remote_check_command()
+    greenlets = {
+        host: state.pool.spawn(host.run_shell_command, command)
+        for host in hosts.get_active_hosts()
+    }
+    gevent.joinall(list(greenlets.values()))
+    disconnect_all(state)
+
+    statuses = []
+    for host in hosts:
+        greenlet = greenlets.get(host)
+        if greenlet is None:
+            statuses.append(HostStatus(host=host.name, error="Could not connect"))
+            continue
+        _, output = greenlet.get()
+        status = parse_host_output(host.name, output.stdout)
+        if status.error and output.stderr:
+            status.error = output.stderr.splitlines()[-1]
+        statuses.append(status)
+    return statuses
@@ -0,0 +1,26 @@
+"""Fleet status types."""
+
+from dataclasses import dataclass, field
+
+from videonode_sbc_config.deploys.verify import CheckResult, CheckStatus
+from videonode_sbc_config.platform import Platform
+
+DEFAULT_PARALLEL = 10
+LOCAL_INVENTORY = "@local"
+
+
+@dataclass
+class HostStatus:
+    """Check results of one inventory host (error set if it was unreachable)."""
+
+    host: str
+    platform: Platform | None = None
+    results: list[CheckResult] = field(default_factory=list)
+    error: str | None = None
+
+    def count(self, *statuses: CheckStatus) -> int:
+        return sum(1 for r in self.results if r.status in statuses)
+
+    @property
+    def healthy(self) -> bool:
+        return not self.error and not self.count(CheckStatus.FAIL, CheckStatus.TIMEOUT)
@@ -1,6 +1,14 @@
 """Platform detection for SBC configuration."""
 
-from .detect import detect_platform
+from .detect import DETECTION_SOURCES, detect_platform, platform_from_sources
 from .types import OSType, Platform, SBCFamily, SBCModel
 
-__all__ = ["detect_platform", "OSType", "Platform", "SBCFamily", "SBCModel"]
+__all__ = [
+    "DETECTION_SOURCES",
+    "detect_platform",
+    "platform_from_sources",
+    "OSType",
+    "Platform",
+    "SBCFamily",
+    "SBCModel",
+]
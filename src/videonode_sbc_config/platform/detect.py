@@ -1,9 +1,29 @@
 """Platform detection logic."""
 
+import json
+import os
 from pathlib import Path
 
+from .. import __version__
+from .registry import match_sbc
 from .types import OSType, Platform, SBCFamily, SBCModel
 
+# Cache lives on tmpfs so it is dropped on reboot; boot_id guards the
+# fallback locations. /proc sources cannot change within a boot, so only
+# the /etc and /boot files are tracked by mtime. Entries written by another
+# release or cache format are ignored, since detection rules change with them.
+CACHE_VERSION = 1
+CACHE_DIR = "/run/videonode-sbc-config"
+CACHE_FILE = "platform.json"
+BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+TRACKED_SOURCES = ("/etc/armbian-release", "/boot/dietpi.txt", "/etc/os-release")
+# Every file detection reads; a remote host only has to send these back
+DETECTION_SOURCES = (
+    *TRACKED_SOURCES,
+    "/proc/device-tree/compatible",
+    "/proc/version",
+)
+
 
 def _read_file(path: str) -> str | None:
     """Read file contents, return None if not found."""
@@ -13,13 +33,13 @@ def _read_file(path: str) -> str | None:
         return None
 
 
-def _detect_os() -> tuple[OSType, str, str]:
+def _detect_os(sources: dict[str, str | None]) -> tuple[OSType, str, str]:
     """Detect OS type, version, and board identifier."""
     # Check for Armbian first (it's based on Debian/Ubuntu)
-    if Path("/etc/armbian-release").exists():
+    content = sources.get("/etc/armbian-release")
+    if content is not None:
         version = ""
         board = ""
-        content = _read_file("/etc/armbian-release")
         if content:
             for line in content.splitlines():
                 if line.startswith("VERSION="):
@@ -29,11 +49,11 @@ def _detect_os() -> tuple[OSType, str, str]:
         return OSType.ARMBIAN, version, board
 
     # Check for DietPi
-    if Path("/boot/dietpi.txt").exists():
+    if sources.get("/boot/dietpi.txt") is not None:
         return OSType.DIETPI, "", ""
 
     # Fall back to /etc/os-release
-    os_release = _read_file("/etc/os-release")
+    os_release = sources.get("/etc/os-release")
     if os_release:
         os_id = ""
         for line in os_release.splitlines():
@@ -47,57 +67,95 @@ def _detect_os() -> tuple[OSType, str, str]:
     return OSType.UNKNOWN, "", ""
 
 
-def _detect_sbc() -> tuple[SBCFamily, SBCModel]:
-    """Detect SBC family and model from device tree."""
-    compatible = _read_file("/proc/device-tree/compatible")
-    if not compatible:
-        return SBCFamily.UNKNOWN, SBCModel.UNKNOWN
-
-    # Device tree compatible strings are null-separated
-    compatible = compatible.replace("\x00", "\n").lower()
-
-    # Rockchip detection
-    if "rockchip" in compatible:
-        family = SBCFamily.ROCKCHIP
-        if "rk3588s" in compatible:
-            return family, SBCModel.RK3588S
-        if "rk3588" in compatible:
-            return family, SBCModel.RK3588
-        if "rk3576" in compatible:
-            return family, SBCModel.RK3576
-        if "rk3566" in compatible:
-            return family, SBCModel.RK3566
-        return family, SBCModel.UNKNOWN
-
-    # Raspberry Pi detection
-    model = _read_file("/proc/device-tree/model") or ""
-    model = model.replace("\x00", "").lower()
-    if "raspberry" in model or "bcm2" in compatible:
-        family = SBCFamily.RASPBERRY_PI
-        if "pi 5" in model:
-            return family, SBCModel.RPI5
-        if "pi 4" in model:
-            return family, SBCModel.RPI4
-        return family, SBCModel.UNKNOWN
-
-    # Allwinner detection
-    if "allwinner" in compatible or "sun" in compatible:
-        family = SBCFamily.ALLWINNER
-        if "h618" in compatible:
-            return family, SBCModel.H618
-        if "h616" in compatible:
-            return family, SBCModel.H616
-        return family, SBCModel.UNKNOWN
-
-    return SBCFamily.UNKNOWN, SBCModel.UNKNOWN
-
-
-def detect_platform() -> Platform:
+def _detect_sbc(
+    sources: dict[str, str | None], board: str = ""
+) -> tuple[SBCFamily, SBCModel]:
+    """Detect SBC family and model from device tree and Armbian board."""
+    compatible = sources.get("/proc/device-tree/compatible") or ""
+    return match_sbc(compatible, board)
+
+
+def _cache_path() -> Path | None:
+    """Return a writable cache location, preferring /run."""
+    if os.access("/run", os.W_OK):
+        return Path(CACHE_DIR) / CACHE_FILE
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "videonode-sbc-config" / CACHE_FILE
+    return None
+
+
+def _source_mtimes() -> dict[str, int | None]:
+    mtimes: dict[str, int | None] = {}
+    for path in TRACKED_SOURCES:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+def _load_cached(path: Path, boot_id: str | None) -> Platform | None:
+    try:
+        data = json.loads(path.read_text())
+        if (
+            data["version"] != CACHE_VERSION
+            or data["package_version"] != __version__
+            or data["boot_id"] != boot_id
+            or data["mtimes"] != _source_mtimes()
+        ):
+            return None
+        return Platform.from_dict(data["platform"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _store_cached(path: Path, boot_id: str | None, platform: Platform) -> None:
+    data = {
+        "version": CACHE_VERSION,
+        "package_version": __version__,
+        "boot_id": boot_id,
+        "mtimes": _source_mtimes(),
+        "platform": platform.to_dict(),
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def detect_platform(use_cache: bool = True) -> Platform:
+    """Detect platform, reusing the cached result from this boot if valid."""
+    path = _cache_path() if use_cache else None
+    if path is None:
+        return _detect_platform()
+
+    boot_id = _read_file(BOOT_ID_PATH)
+    platform = _load_cached(path, boot_id)
+    if platform is None:
+        platform = _detect_platform()
+        _store_cached(path, boot_id, platform)
+    return platform
+
+
+def _detect_platform() -> Platform:
     """Detect full platform information."""
-    os_type, os_version, board = _detect_os()
-    sbc_family, sbc_model = _detect_sbc()
+    return platform_from_sources({path: _read_file(path) for path in DETECTION_SOURCES})
+
+
+def platform_from_sources(sources: dict[str, str | None]) -> Platform:
+    """Detect platform from the stripped contents of DETECTION_SOURCES.
+
+    Missing files map to None. Used for hosts whose files were read
+    remotely.
+    """
+    os_type, os_version, board = _detect_os(sources)
+    sbc_family, sbc_model = _detect_sbc(sources, board)
 
-    kernel = _read_file("/proc/version")
+    kernel = sources.get("/proc/version")
     kernel_version = ""
     if kernel:
         parts = kernel.split()
@@ -0,0 +1,116 @@
+"""Device tree compatible and board registry for SBC detection.
+
+To add a board, add its Armbian BOARD name (and board-level compatible
+string, if any) to the entry for its SoC. To add a SoC, add a new entry.
+"""
+
+from dataclasses import dataclass
+
+from .types import SBCFamily, SBCModel
+
+
+@dataclass(frozen=True)
+class SocEntry:
+    family: SBCFamily
+    model: SBCModel
+    compatible: tuple[str, ...] = ()  # Exact device tree compatible tokens
+    boards: tuple[str, ...] = ()  # Armbian BOARD identifiers
+
+
+REGISTRY: list[SocEntry] = [
+    # Rockchip
+    SocEntry(
+        SBCFamily.ROCKCHIP,
+        SBCModel.RK3588,
+        compatible=("rockchip,rk3588",),
+        boards=(
+            "orangepi5-plus",
+            "orangepi5max",
+            "orangepi5ultra",
+            "rock-5b",
+            "rock-5b-plus",
+        ),
+    ),
+    SocEntry(
+        SBCFamily.ROCKCHIP,
+        SBCModel.RK3588S,
+        compatible=("rockchip,rk3588s",),
+        boards=("orangepi5", "orangepi5b", "orangepi5pro", "rock-5a", "nanopi-r6s"),
+    ),
+    SocEntry(
+        SBCFamily.ROCKCHIP,
+        SBCModel.RK3576,
+        compatible=("rockchip,rk3576",),
+    ),
+    SocEntry(
+        SBCFamily.ROCKCHIP,
+        SBCModel.RK3566,
+        compatible=("rockchip,rk3566",),
+        boards=("orangepi3b", "radxa-zero3"),
+    ),
+    # Raspberry Pi
+    SocEntry(
+        SBCFamily.RASPBERRY_PI,
+        SBCModel.RPI4,
+        compatible=("raspberrypi,4-model-b", "brcm,bcm2711"),
+        boards=("rpi4b",),
+    ),
+    SocEntry(
+        SBCFamily.RASPBERRY_PI,
+        SBCModel.RPI5,
+        compatible=("raspberrypi,5-model-b", "brcm,bcm2712"),
+    ),
+    # Allwinner
+    SocEntry(
+        SBCFamily.ALLWINNER,
+        SBCModel.H616,
+        compatible=("allwinner,sun50i-h616",),
+        boards=("orangepizero2",),
+    ),
+    SocEntry(
+        SBCFamily.ALLWINNER,
+        SBCModel.H618,
+        compatible=("allwinner,sun50i-h618",),
+        boards=("orangepizero3",),
+    ),
+]
+
+# Compatible vendor prefix -> family, for SoCs not (yet) in the registry
+VENDOR_FAMILIES: dict[str, SBCFamily] = {
+    "rockchip": SBCFamily.ROCKCHIP,
+    "raspberrypi": SBCFamily.RASPBERRY_PI,
+    "brcm": SBCFamily.RASPBERRY_PI,
+    "allwinner": SBCFamily.ALLWINNER,
+}
+
+COMPATIBLE_INDEX: dict[str, SocEntry] = {
+    token: entry for entry in REGISTRY for token in entry.compatible
+}
+BOARD_INDEX: dict[str, SocEntry] = {
+    board: entry for entry in REGISTRY for board in entry.boards
+}
+
+
+def match_sbc(compatible: str, board: str = "") -> tuple[SBCFamily, SBCModel]:
+    """Match a null-separated compatible blob and Armbian BOARD to a SoC.
+
+    Tokens are checked in device tree order (most specific first), so the
+    first registered token wins. The board entry is used when no token
+    identifies the SoC.
+    """
+    family = SBCFamily.UNKNOWN
+    for token in compatible.lower().split("\x00"):
+        token = token.strip()
+        if not token:
+            continue
+        entry = COMPATIBLE_INDEX.get(token)
+        if entry:
+            return entry.family, entry.model
+        if family == SBCFamily.UNKNOWN:
+            vendor = token.partition(",")[0]
+            family = VENDOR_FAMILIES.get(vendor, SBCFamily.UNKNOWN)
+
+    entry = BOARD_INDEX.get(board.lower())
+    if entry and family in (SBCFamily.UNKNOWN, entry.family):
+        return entry.family, entry.model
+    return family, SBCModel.UNKNOWN
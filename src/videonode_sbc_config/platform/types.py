@@ -66,5 +66,26 @@ class Platform:
         """Check if this platform is currently supported."""
         return self.is_rockchip and self.is_armbian
 
+    def to_dict(self) -> dict[str, str]:
+        return {
+            "sbc_family": self.sbc_family.name,
+            "sbc_model": self.sbc_model.name,
+            "os_type": self.os_type.name,
+            "os_version": self.os_version,
+            "kernel_version": self.kernel_version,
+            "board": self.board,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, str]) -> "Platform":
+        return cls(
+            os_type=OSType[data["os_type"]],
+            sbc_family=SBCFamily[data["sbc_family"]],
+            sbc_model=SBCModel[data["sbc_model"]],
+            os_version=data.get("os_version", ""),
+            kernel_version=data.get("kernel_version", ""),
+            board=data.get("board", ""),
+        )
+
     def __str__(self) -> str:
         return f"{self.sbc_family.name}/{self.sbc_model.name} on {self.os_type.name}"
@@ -1,5 +1,15 @@
 """UI rendering module."""
 
-from .dashboard import render_dashboard, run_interactive
+from .bench import render_bench_results
+from .dashboard import render_dashboard, run_interactive, watch_dashboard
+from .fleet import render_fleet_status
+from .profile import render_check_profile
 
-__all__ = ["render_dashboard", "run_interactive"]
+__all__ = [
+    "render_bench_results",
+    "render_check_profile",
+    "render_dashboard",
+    "render_fleet_status",
+    "run_interactive",
+    "watch_dashboard",
+]
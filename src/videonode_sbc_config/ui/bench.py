@@ -0,0 +1,93 @@
+"""Rich rendering for encoder benchmark results."""
+
+from rich.console import Console
+from rich.table import Table
+
+from videonode_sbc_config.bench import BenchComparison, BenchResult
+
+
+def _build_bench_table(results: list[BenchResult]) -> Table:
+    table = Table(show_header=True, header_style="bold", box=None)
+    table.add_column("Encoder", style="cyan", no_wrap=True)
+    table.add_column("Res", justify="right")
+    table.add_column("Bitrate", justify="right")
+    table.add_column("Streams", justify="right")
+    table.add_column("FPS", justify="right")
+    table.add_column("Min FPS", justify="right")
+    table.add_column("Speed", justify="right")
+    table.add_column("CPU%", justify="right")
+    table.add_column("Latency", justify="right")
+
+    for r in results:
+        c = r.config
+        if r.error:
+            table.add_row(
+                c.encoder,
+                c.resolution,
+                c.bitrate,
+                str(c.streams),
+                f"[red]{r.error}[/red]",
+            )
+            continue
+        table.add_row(
+            c.encoder,
+            c.resolution,
+            c.bitrate,
+            str(c.streams),
+            f"{r.fps:.1f}",
+            f"{r.min_fps:.1f}",
+            f"{r.speed:.2f}x",
+            f"{r.cpu_percent:.0f}",
+            f"{r.latency_ms:.0f} ms",
+        )
+
+    return table
+
+
+def _build_comparison_table(comparisons: list[BenchComparison]) -> Table:
+    table = Table(show_header=True, header_style="bold", box=None)
+    table.add_column("Encoder", style="cyan", no_wrap=True)
+    table.add_column("Res", justify="right")
+    table.add_column("Bitrate", justify="right")
+    table.add_column("Streams", justify="right")
+    table.add_column("Baseline", justify="right")
+    table.add_column("FPS", justify="right")
+    table.add_column("Change", justify="right")
+
+    for comp in comparisons:
+        c = comp.config
+        change = f"{comp.change:+.1%}"
+        if comp.regressed:
+            change = f"[red bold]{change}[/red bold]"
+        table.add_row(
+            c.encoder,
+            c.resolution,
+            c.bitrate,
+            str(c.streams),
+            f"{comp.baseline_fps:.1f}",
+            f"{comp.fps:.1f}",
+            change,
+        )
+
+    return table
+
+
+def render_bench_results(
+    results: list[BenchResult],
+    comparisons: list[BenchComparison] | None = None,
+    baseline_versions: dict[str, str] | None = None,
+) -> None:
+    console = Console()
+    console.print(_build_bench_table(results))
+    if comparisons is None:
+        return
+
+    console.print()
+    versions = ", ".join(f"{k} {v}" for k, v in (baseline_versions or {}).items())
+    console.print(f"[bold]Compared with baseline[/bold] [dim]({versions})[/dim]")
+    console.print(_build_comparison_table(comparisons))
+    regressed = sum(1 for c in comparisons if c.regressed)
+    if regressed:
+        console.print(f"[red bold]{regressed} REGRESSIONS[/red bold]")
+    else:
+        console.print("[green bold]NO REGRESSIONS[/green bold]")
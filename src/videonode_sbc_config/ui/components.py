@@ -9,6 +9,7 @@ class InstallableComponent:
     key: str
     name: str
     help_text: str
+    setup_component: str | None = None  # Component name of deploys/setup.py
     deploy_fn: Callable[[], Any] | None = None
     scripts: list[str] = field(default_factory=list)  # Kept for backwards compat
     checks: list[str] = field(default_factory=list)
@@ -16,32 +17,19 @@ class InstallableComponent:
 
 
 def _get_rockchip_components() -> list[InstallableComponent]:
-    """Lazily import and create Rockchip components to avoid circular imports."""
-    from videonode_sbc_config.deploys.generic.cockpit import install_cockpit
-    from videonode_sbc_config.deploys.generic.led_permissions import (
-        setup_led_permissions,
-    )
-    from videonode_sbc_config.deploys.hardware.rockchip.permissions import (
-        setup_permissions,
-    )
-    from videonode_sbc_config.deploys.hardware.rockchip.stack import (
-        install_rockchip_stack,
-    )
-    from videonode_sbc_config.deploys.os.armbian.led_disable import disable_leds
-
     return [
         InstallableComponent(
             key="1",
             name="FFmpeg stack",
             help_text="MPP/RGA hardware encoding",
-            deploy_fn=lambda: install_rockchip_stack(_sudo=True),
+            setup_component="stack",
             checks=["FFmpeg encoders"],
         ),
         InstallableComponent(
             key="2",
             name="Device permissions",
             help_text="MPP/RGA/DMA device access",
-            deploy_fn=lambda: setup_permissions(_sudo=True),
+            setup_component="permissions",
             checks=["MPP permissions", "RGA permissions", "DMA heap permissions"],
         ),
         InstallableComponent(
@@ -54,17 +42,14 @@ def _get_rockchip_components() -> list[InstallableComponent]:
             key="4",
             name="LED control",
             help_text="Disable status LEDs",
-            deploy_fn=lambda: (
-                setup_led_permissions(_sudo=True),
-                disable_leds(_sudo=True),
-            ),
+            setup_component="leds",
             checks=["Blue LED", "Green LED"],
         ),
         InstallableComponent(
             key="5",
             name="Cockpit",
             help_text="Web management panel",
-            deploy_fn=lambda: install_cockpit(_sudo=True),
+            setup_component="cockpit",
             checks=["Cockpit"],
         ),
     ]
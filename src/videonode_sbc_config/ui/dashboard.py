@@ -2,16 +2,23 @@
 
 import subprocess
 import sys
+import time
 from importlib.resources import files
 
-import readchar
-from rich.console import Console
+from rich.console import Console, Group
+from rich.live import Live
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
 from videonode_sbc_config.deploys.hardware.rockchip.overlays import OVERLAYS
-from videonode_sbc_config.deploys.verify import CheckResult, CheckStatus, run_all_checks
+from videonode_sbc_config.deploys.verify import (
+    CheckCache,
+    CheckResult,
+    CheckStatus,
+    run_all_checks,
+)
+from videonode_sbc_config.fleet import run_setup
 from videonode_sbc_config.platform import Platform
 
 from .components import InstallableComponent, get_components_for_platform
@@ -21,6 +28,7 @@ STATUS_ICONS = {
     CheckStatus.FAIL: "[red]FAIL[/red]",
     CheckStatus.INFO: "[dim]-[/dim]",
     CheckStatus.SKIP: "[dim]SKIP[/dim]",
+    CheckStatus.TIMEOUT: "[yellow]TIME[/yellow]",
 }
 
 
@@ -124,10 +132,20 @@ def _build_footer(components: list[InstallableComponent]) -> Text:
 def _run_install(
     component: InstallableComponent, platform: Platform, console: Console
 ) -> None:
+    import readchar
+
     console.clear()
     console.print(f"\n[bold cyan]Installing {component.name}...[/bold cyan]\n")
 
-    if component.deploy_fn:
+    if component.setup_component:
+        # Runs deploys/setup.py through pyinfra, which also prints the
+        # operation timing breakdown
+        returncode = run_setup(components=[component.setup_component])
+        if returncode != 0:
+            console.print(f"[red]Installation failed with code {returncode}[/red]")
+        else:
+            console.print(f"\n[green]{component.name} installed successfully[/green]")
+    elif component.deploy_fn:
         try:
             component.deploy_fn()
             console.print(f"\n[green]{component.name} installed successfully[/green]")
@@ -155,30 +173,37 @@ def _run_install(
     readchar.readkey()
 
 
-def _run_overlay_submenu(platform: Platform, console: Console) -> None:
+def _run_overlay_submenu(
+    platform: Platform, console: Console, cache: CheckCache
+) -> None:
     """Show overlay selection submenu."""
-    deploys = files("videonode_sbc_config.deploys")
+    import readchar
+
+    selected: list[str] = []  # Overlay IDs, in selection order
 
     while True:
         console.clear()
-        results = run_all_checks(platform)
+        results = run_all_checks(platform, cache)
 
-        console.print(Panel("Select an overlay to install", title="Kernel Overlays"))
+        console.print(Panel("Select overlays to install", title="Kernel Overlays"))
         console.print()
 
         table = Table(show_header=True, header_style="bold", box=None)
         table.add_column("#", style="cyan", width=3)
+        table.add_column("", width=3)
         table.add_column("Overlay", min_width=20)
         table.add_column("Status", justify="center", width=14)
         table.add_column("Description", min_width=30)
 
         overlay_map: dict[str, str] = {}
+        overlay_check_names: dict[str, str] = {}
         for i, overlay in enumerate(OVERLAYS, 1):
             key = str(i)
             overlay_map[key] = overlay.id
 
             # Find status from results
             check_name = f"Overlay: {overlay.name}"
+            overlay_check_names[overlay.id] = check_name
             installed = False
             for r in results:
                 if r.name == check_name:
@@ -190,6 +215,7 @@ def _run_overlay_submenu(platform: Platform, console: Console) -> None:
             )
             table.add_row(
                 f"[{key}]",
+                "[x]" if overlay.id in selected else "[ ]",
                 overlay.name,
                 status_text,
                 overlay.description,
@@ -198,7 +224,11 @@ def _run_overlay_submenu(platform: Platform, console: Console) -> None:
         console.print(table)
         console.print()
         console.print(
-            Text(f"Press 1-{len(OVERLAYS)} to install, b to go back", style="dim")
+            Text(
+                f"Press 1-{len(OVERLAYS)} to select, i to install selected, "
+                "b to go back",
+                style="dim",
+            )
         )
 
         try:
@@ -211,33 +241,33 @@ def _run_overlay_submenu(platform: Platform, console: Console) -> None:
 
         if key in overlay_map:
             overlay_id = overlay_map[key]
+            if overlay_id in selected:
+                selected.remove(overlay_id)
+            else:
+                selected.append(overlay_id)
+
+        elif key in ("i", "I", readchar.key.ENTER) and selected:
             console.clear()
-            console.print(
-                f"\n[bold cyan]Installing overlay: {overlay_id}...[/bold cyan]\n"
-            )
+            names = ", ".join(selected)
+            console.print(f"\n[bold cyan]Installing overlays: {names}...[/bold cyan]\n")
 
-            path = deploys.joinpath("os/armbian/kernel_overlays.py")
-            cmd = ["pyinfra", "@local", str(path), "--data", f"overlay_id={overlay_id}"]
-            result = subprocess.run(cmd)
+            # All selected overlays in one deploy run
+            returncode = run_setup(
+                components=["overlays"], data=[f"overlay_ids={','.join(selected)}"]
+            )
+            cache.invalidate([overlay_check_names[o] for o in selected])
+            selected.clear()
 
-            if result.returncode != 0:
-                console.print(f"[red]Failed with code {result.returncode}[/red]")
+            if returncode != 0:
+                console.print(f"[red]Failed with code {returncode}[/red]")
             else:
-                console.print("\n[green]Overlay installed (reboot required)[/green]")
+                console.print("\n[green]Overlays installed (reboot required)[/green]")
 
             console.print("\n[dim]Press any key to continue...[/dim]")
             readchar.readkey()
 
 
-def render_dashboard(
-    platform: Platform,
-    results: list[CheckResult],
-    verbose: bool = False,
-) -> None:
-    console = Console()
-    console.print(_build_platform_panel(platform))
-    console.print()
-
+def _build_status_table(results: list[CheckResult], verbose: bool) -> Table:
     table = Table(show_header=True, header_style="bold")
     table.add_column("Check", style="cyan", min_width=20)
     table.add_column("Status", justify="center", width=6)
@@ -249,37 +279,93 @@ def render_dashboard(
             details += f" [dim]({check.remediation})[/dim]"
         table.add_row(check.name, STATUS_ICONS[check.status], details)
 
-    console.print(table)
-    console.print()
+    return table
 
+
+def _build_summary_panel(results: list[CheckResult]) -> Panel:
     passed = sum(1 for c in results if c.status == CheckStatus.PASS)
     failed = sum(1 for c in results if c.status == CheckStatus.FAIL)
     skipped = sum(1 for c in results if c.status == CheckStatus.SKIP)
+    timed_out = sum(1 for c in results if c.status == CheckStatus.TIMEOUT)
 
-    if failed == 0:
+    if failed == 0 and timed_out == 0:
         summary = "[green bold]ALL CHECKS PASSED[/green bold]"
         border_style = "green"
+    elif failed == 0:
+        summary = f"[yellow bold]{timed_out} CHECKS TIMED OUT[/yellow bold]"
+        border_style = "yellow"
     else:
         summary = f"[red bold]{failed} CHECKS FAILED[/red bold]"
         border_style = "red"
 
     stats = f"Passed: {passed} | Failed: {failed}"
+    if timed_out > 0:
+        stats += f" | Timed out: {timed_out}"
     if skipped > 0:
         stats += f" | Skipped: {skipped}"
 
-    console.print(
-        Panel(f"{summary}\n{stats}", title="Summary", border_style=border_style)
+    return Panel(f"{summary}\n{stats}", title="Summary", border_style=border_style)
+
+
+def _build_status_view(
+    platform: Platform, results: list[CheckResult], verbose: bool
+) -> Group:
+    return Group(
+        _build_platform_panel(platform),
+        Text(),
+        _build_status_table(results, verbose),
+        Text(),
+        _build_summary_panel(results),
     )
 
 
+def render_dashboard(
+    platform: Platform,
+    results: list[CheckResult],
+    verbose: bool = False,
+) -> None:
+    console = Console()
+    console.print(_build_status_view(platform, results, verbose))
+
+
+def watch_dashboard(
+    platform: Platform, interval: float = 1.0, verbose: bool = False
+) -> list[CheckResult]:
+    """Keep the status view open, refreshing checks as their TTLs expire.
+
+    Each tick only re-runs checks whose cached result is stale, so cheap
+    probes refresh every tick while expensive ones follow their own TTL or
+    the mtime of the files they depend on. Returns the last results on
+    Ctrl+C.
+    """
+    cache = CheckCache()
+    results = run_all_checks(platform, cache)
+    with Live(
+        _build_status_view(platform, results, verbose), auto_refresh=False
+    ) as live:
+        try:
+            while True:
+                time.sleep(interval)
+                results = run_all_checks(platform, cache)
+                live.update(
+                    _build_status_view(platform, results, verbose), refresh=True
+                )
+        except KeyboardInterrupt:
+            pass
+    return results
+
+
 def run_interactive(platform: Platform) -> None:
+    import readchar
+
     console = Console()
     components = get_components_for_platform(platform.is_rockchip, platform.is_armbian)
     component_map = {c.key: c for c in components}
+    cache = CheckCache()
 
     while True:
         console.clear()
-        results = run_all_checks(platform)
+        results = run_all_checks(platform, cache)
 
         console.print(_build_platform_panel(platform))
         console.print()
@@ -313,6 +399,7 @@ def run_interactive(platform: Platform) -> None:
         if key in component_map:
             comp = component_map[key]
             if comp.has_submenu:
-                _run_overlay_submenu(platform, console)
+                _run_overlay_submenu(platform, console, cache)
             else:
                 _run_install(comp, platform, console)
+                cache.invalidate(comp.checks)
@@ -0,0 +1,53 @@
+"""Rich rendering for fleet status."""
+
+from rich.console import Console
+from rich.table import Table
+
+from videonode_sbc_config.deploys.verify import CheckStatus
+from videonode_sbc_config.fleet import HostStatus
+
+
+def _build_fleet_table(statuses: list[HostStatus], verbose: bool) -> Table:
+    table = Table(show_header=True, header_style="bold")
+    table.add_column("Host", style="cyan", no_wrap=True)
+    table.add_column("Platform")
+    table.add_column("Status", justify="center", width=6)
+    table.add_column("Passed", justify="right")
+    table.add_column("Failed", justify="right")
+    table.add_column("Details", min_width=20)
+
+    for status in statuses:
+        if status.error:
+            table.add_row(status.host, "-", "[red]DOWN[/red]", "-", "-", status.error)
+            continue
+
+        failing = [
+            r
+            for r in status.results
+            if r.status in (CheckStatus.FAIL, CheckStatus.TIMEOUT)
+        ]
+        details = ", ".join(r.name for r in failing)
+        if verbose:
+            details = "; ".join(
+                f"{r.name}: {r.remediation or r.message}" for r in failing
+            )
+        table.add_row(
+            status.host,
+            status.platform.sbc_model.name if status.platform else "-",
+            "[green]OK[/green]" if status.healthy else "[red]FAIL[/red]",
+            str(status.count(CheckStatus.PASS)),
+            str(len(failing)),
+            details,
+        )
+
+    return table
+
+
+def render_fleet_status(statuses: list[HostStatus], verbose: bool = False) -> None:
+    console = Console()
+    console.print(_build_fleet_table(statuses, verbose))
+    unhealthy = sum(1 for s in statuses if not s.healthy)
+    if unhealthy:
+        console.print(f"[red bold]{unhealthy}/{len(statuses)} HOSTS FAILING[/red bold]")
+    else:
+        console.print(f"[green bold]ALL {len(statuses)} HOSTS OK[/green bold]")
@@ -0,0 +1,48 @@
+"""Rich rendering for check timings (`status --profile`)."""
+
+from rich.console import Console
+from rich.table import Table
+
+from videonode_sbc_config.deploys.verify import CheckResult
+
+PROFILE_LIMIT = 10  # Slowest checks shown
+
+
+def _ms(seconds: float | None) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.1f}"
+
+
+def _build_profile_table(results: list[CheckResult], limit: int) -> Table:
+    table = Table(show_header=True, header_style="bold", box=None)
+    table.add_column("Check", style="cyan", no_wrap=True)
+    table.add_column("Wall ms", justify="right")
+    table.add_column("Spawn ms", justify="right")
+    table.add_column("Output", justify="right")
+
+    slowest = sorted(results, key=lambda r: r.duration, reverse=True)[:limit]
+    for result in slowest:
+        table.add_row(
+            result.name,
+            _ms(result.duration),
+            _ms(result.spawn_time),
+            f"{result.output_bytes} B",
+        )
+    return table
+
+
+def render_check_profile(
+    results: list[CheckResult], wall_time: float, limit: int = PROFILE_LIMIT
+) -> None:
+    """Print the slowest checks and the suite totals.
+
+    The summed check time exceeds wall_time when checks run concurrently.
+    """
+    console = Console()
+    console.print()
+    console.print(f"[bold]Slowest checks[/bold] (top {min(limit, len(results))})")
+    console.print(_build_profile_table(results, limit))
+    spawn = sum(r.spawn_time or 0.0 for r in results)
+    console.print(
+        f"Total: {len(results)} checks, {_ms(sum(r.duration for r in results))} ms "
+        f"summed ({_ms(spawn)} ms spawning), {_ms(wall_time)} ms wall"
+    )
@@ -0,0 +1,93 @@
+"""Baseline lookup and regression comparison of the bench subcommand."""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from videonode_sbc_config.bench.baseline import (
+    compare_results,
+    get_ffmpeg_profile,
+    load_baseline,
+)
+from videonode_sbc_config.bench.types import BenchConfig, BenchResult
+from videonode_sbc_config.platform import OSType, Platform, SBCFamily, SBCModel
+
+BOARD = Platform(OSType.ARMBIAN, SBCFamily.ROCKCHIP, SBCModel.RK3588, board="rock-5b")
+OTHER_BOARD = Platform(OSType.ARMBIAN, SBCFamily.ROCKCHIP, SBCModel.RK3566)
+CONFIG = BenchConfig("h264_rkmpp", "1080p", 1920, 1080, "4M", 1)
+
+
+def _record(fingerprint: str, fps: float, platform: Platform = BOARD) -> dict:
+    return {
+        "timestamp": 0,
+        "fingerprint": fingerprint,
+        "platform": platform.to_dict(),
+        "versions": {},
+        "frames": 300,
+        "results": [BenchResult(CONFIG, fps=fps).to_dict()],
+    }
+
+
+class LoadBaselineTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = Path(tmp.name) / "bench.jsonl"
+
+    def _write(self, *records: dict) -> None:
+        self.store.write_text("".join(json.dumps(r) + "\n" for r in records))
+
+    def test_prefers_previous_stack(self) -> None:
+        # Old stack, then a regressed run of the current stack saved with --save
+        self._write(_record("old", 100.0), _record("new", 80.0))
+        baseline = load_baseline(BOARD, 300, self.store, fingerprint="new")
+        self.assertEqual(baseline["fingerprint"], "old")
+
+    def test_falls_back_to_current_stack(self) -> None:
+        self._write(_record("new", 90.0), _record("new", 95.0))
+        baseline = load_baseline(BOARD, 300, self.store, fingerprint="new")
+        self.assertEqual(baseline["results"][0]["fps"], 95.0)
+
+    def test_ignores_other_boards_and_frame_counts(self) -> None:
+        other_frames = _record("old", 50.0)
+        other_frames["frames"] = 100
+        self._write(_record("old", 100.0), other_frames, _record("x", 1.0, OTHER_BOARD))
+        baseline = load_baseline(BOARD, 300, self.store, fingerprint="new")
+        self.assertEqual(baseline["results"][0]["fps"], 100.0)
+
+    def test_missing_store(self) -> None:
+        self.assertIsNone(load_baseline(BOARD, 300, self.store))
+
+
+class FfmpegProfileTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.stamp = Path(tmp.name) / "ffmpeg.stamp"
+
+    def test_profile_from_stamp(self) -> None:
+        self.stamp.write_text("key=abc\nref=v7.1\nflags=--enable-lto\nprofile=size\n")
+        self.assertEqual(get_ffmpeg_profile(str(self.stamp)), "size")
+
+    def test_stamp_without_profile(self) -> None:
+        self.stamp.write_text("key=abc\nref=v7.1\nflags=\n")
+        self.assertEqual(get_ffmpeg_profile(str(self.stamp)), "unknown")
+        self.stamp.unlink()
+        self.assertEqual(get_ffmpeg_profile(str(self.stamp)), "unknown")
+
+
+class CompareResultsTest(unittest.TestCase):
+    def test_flags_drop_beyond_threshold(self) -> None:
+        baseline = _record("old", 100.0)
+        (comparison,) = compare_results([BenchResult(CONFIG, fps=80.0)], baseline, 0.1)
+        self.assertTrue(comparison.regressed)
+        self.assertAlmostEqual(comparison.change, -0.2)
+
+    def test_skips_failed_results(self) -> None:
+        failed = BenchResult(CONFIG, error="exit 1")
+        self.assertEqual(compare_results([failed], _record("old", 100.0)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+"""The bench subcommand end to end against the stub ffmpeg."""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from click.testing import CliRunner
+
+from videonode_sbc_config.bench import stub
+from videonode_sbc_config.cli import main
+
+MATRIX = [
+    "--encoder", "h264_rkmpp",
+    "--encoder", "hevc_rkmpp",
+    "--resolution", "1080p",
+    "--bitrate", "4M",
+    "--streams", "1",
+    "--streams", "2",
+    "--frames", "30",
+]  # fmt: skip
+RESULT_KEYS = {
+    "encoder",
+    "resolution",
+    "width",
+    "height",
+    "bitrate",
+    "streams",
+    "fps",
+    "min_fps",
+    "speed",
+    "cpu_percent",
+    "latency_ms",
+    "error",
+}
+STUB_FPS = round(stub.PIXEL_RATE / (1920 * 1080), 1)
+
+
+class BenchStubTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = Path(tmp.name) / "bench.jsonl"
+
+    def _bench(self, *args: str) -> tuple[int, str]:
+        runner = CliRunner()
+        result = runner.invoke(
+            main, ["bench", "--stub", *MATRIX, "--store", str(self.store), *args]
+        )
+        return result.exit_code, result.stdout
+
+    def test_json(self) -> None:
+        exit_code, output = self._bench("--json")
+        self.assertEqual(exit_code, 0)
+        data = json.loads(output)
+        self.assertLessEqual(
+            {"platform", "versions", "fingerprint", "ffmpeg", "frames", "results"},
+            data.keys(),
+        )
+        self.assertNotIn("comparison", data)
+        self.assertEqual(data["frames"], 30)
+        self.assertIn("videonode_sbc_config.bench.stub", data["ffmpeg"])
+
+        results = data["results"]
+        self.assertEqual(
+            [(r["encoder"], r["streams"]) for r in results],
+            [
+                ("h264_rkmpp", 1),
+                ("h264_rkmpp", 2),
+                ("hevc_rkmpp", 1),
+                ("hevc_rkmpp", 2),
+            ],
+        )
+        for result in results:
+            self.assertEqual(result.keys(), RESULT_KEYS)
+            self.assertIsNone(result["error"])
+            self.assertEqual(result["fps"], STUB_FPS)
+            self.assertEqual(result["min_fps"], STUB_FPS)
+            self.assertAlmostEqual(
+                result["speed"], STUB_FPS / stub.SOURCE_RATE, places=2
+            )
+            self.assertGreater(result["latency_ms"], 0)
+            self.assertLess(result["latency_ms"], 30_000)
+
+        # Stub runs are not stored as a baseline unless asked
+        self.assertFalse(self.store.exists())
+
+    def test_table(self) -> None:
+        exit_code, output = self._bench()
+        self.assertEqual(exit_code, 0)
+        header = output.splitlines()[0].split()
+        self.assertEqual(
+            header,
+            "Encoder Res Bitrate Streams FPS Min FPS Speed CPU% Latency".split(),
+        )
+        rows = [line.split() for line in output.splitlines()[1:] if line.strip()]
+        self.assertEqual(len(rows), 4)
+        for row in rows:
+            speed = STUB_FPS / stub.SOURCE_RATE
+            self.assertEqual(
+                row[4:7], [f"{STUB_FPS:.1f}", f"{STUB_FPS:.1f}", f"{speed:.2f}x"]
+            )
+            self.assertEqual(row[-1], "ms")
+
+    def test_failed_configs_set_exit_code(self) -> None:
+        with mock.patch.dict(os.environ, {"VIDEONODE_BENCH_STUB_FAIL": "1"}):
+            exit_code, output = self._bench("--json")
+        self.assertEqual(exit_code, 4)
+        errors = [r["error"] for r in json.loads(output)["results"]]
+        self.assertEqual(errors, ["Stub failure requested"] * 4)
+
+    def test_saved_run_is_compared(self) -> None:
+        self.assertEqual(self._bench("--json", "--save")[0], 0)
+        exit_code, output = self._bench("--json", "--compare")
+        self.assertEqual(exit_code, 0)
+        comparison = json.loads(output)["comparison"]
+        self.assertEqual(len(comparison["results"]), 4)
+        for result in comparison["results"]:
+            self.assertEqual(result["baseline_fps"], STUB_FPS)
+            self.assertFalse(result["regressed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+"""Source build helpers."""
+
+import unittest
+
+from videonode_sbc_config.deploys.build import parse_ccache_stats
+
+CCACHE_4 = """\
+Cacheable calls:   20 / 22 (90.91%)
+  Hits:            12 / 20 (60.00%)
+    Direct:        10 / 12 (83.33%)
+    Preprocessed:   2 / 12 (16.67%)
+  Misses:           8 / 20 (40.00%)
+Uncacheable calls:  2 / 22 ( 9.09%)
+Local storage:
+  Cache size (GB): 0.1 / 5.0 ( 2.00%)
+  Hits:            12 / 20 (60.00%)
+  Misses:           8 / 20 (40.00%)
+"""
+CCACHE_3 = """\
+cache directory                     /var/cache/videonode-sbc-config/ccache
+cache hit (direct)                    10
+cache hit (preprocessed)               2
+cache miss                             8
+cache hit rate                     60.00 %
+"""
+
+
+class ParseCcacheStatsTest(unittest.TestCase):
+    def test_ccache_4(self) -> None:
+        self.assertEqual(parse_ccache_stats(CCACHE_4), (12, 8))
+
+    def test_ccache_3(self) -> None:
+        self.assertEqual(parse_ccache_stats(CCACHE_3), (12, 8))
+
+    def test_unrecognized_output(self) -> None:
+        self.assertIsNone(parse_ccache_stats(""))
+        self.assertIsNone(parse_ccache_stats("ccache: error: unknown option"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+"""Provisioning bundle layout, manifest reading and setup data."""
+
+import io
+import json
+import tarfile
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from videonode_sbc_config.bundle import create, read_manifest
+from videonode_sbc_config.bundle.types import BUNDLE_VERSION, MANIFEST
+from videonode_sbc_config.deploys.build import get_artifact_key, get_artifact_path
+from videonode_sbc_config.deploys.hardware.rockchip.overlays import OVERLAYS, Overlay
+from videonode_sbc_config.deploys.overlay_cache import get_dtbo_name
+from videonode_sbc_config.fleet import setup as fleet_setup
+from videonode_sbc_config.platform import OSType, Platform, SBCFamily, SBCModel
+
+PLATFORM = Platform(
+    OSType.ARMBIAN, SBCFamily.ROCKCHIP, SBCModel.RK3588, board="rock-5b"
+)
+ARCH = "aarch64"
+
+
+class BundleTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+    def write_tar(self, name: str, members: dict[str, bytes]) -> Path:
+        path = self.tmp / name
+        with tarfile.open(path, "w") as tar:
+            for member, data in members.items():
+                info = tarfile.TarInfo(member)
+                info.size = len(data)
+                tar.addfile(info, fileobj=io.BytesIO(data))
+        return path
+
+
+class ReadManifestTest(BundleTestCase):
+    def test_reads_manifest(self) -> None:
+        manifest = {"version": BUNDLE_VERSION, "arch": ARCH}
+        path = self.write_tar("ok.tar", {MANIFEST: json.dumps(manifest).encode()})
+        self.assertEqual(read_manifest(path), manifest)
+
+    def test_unsupported_version(self) -> None:
+        for manifest in ({"version": BUNDLE_VERSION + 1}, {}, []):
+            path = self.write_tar("v.tar", {MANIFEST: json.dumps(manifest).encode()})
+            with self.subTest(manifest=manifest), self.assertRaisesRegex(
+                ValueError, "Unsupported bundle version"
+            ):
+                read_manifest(path)
+
+    def test_corrupt_bundles(self) -> None:
+        not_tar = self.tmp / "not.tar"
+        not_tar.write_bytes(b"\0garbage" * 200)
+        truncated = self.write_tar("full.tar", {MANIFEST: b"{}" * 1000})
+        truncated.write_bytes(truncated.read_bytes()[:700])
+        bundles = [
+            not_tar,
+            self.tmp / "missing.tar",
+            self.write_tar("no-manifest.tar", {"debs/Packages": b""}),
+            self.write_tar("bad-json.tar", {MANIFEST: b"{not json"}),
+            truncated,
+        ]
+        for path in bundles:
+            with self.subTest(path=path.name), self.assertRaisesRegex(
+                ValueError, "Not a provisioning bundle"
+            ):
+                read_manifest(path)
+
+
+class CreateBundleTest(BundleTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.cache = self.tmp / "artifacts"
+        self.cache.mkdir()
+        for build in create.get_bundle_builds("generic"):
+            key = get_artifact_key(build.repo, build.ref, build.flags, ARCH)
+            path = get_artifact_path(str(self.cache), build.project, key)
+            Path(path).write_bytes(build.project.encode())
+
+        self.debs = self.tmp / "debs"
+        self.debs.mkdir()
+        self.downloads = self.tmp / "downloads"
+        self.downloads.mkdir()
+        for url in create.DOWNLOADS:
+            (self.downloads / url.rsplit("/", 1)[-1]).write_bytes(b"download")
+
+        # Stand-in for dtc, which is not needed to check the layout
+        overlays = self.tmp / "overlays"
+        overlays.mkdir()
+
+        def compiled(overlay: Overlay) -> Path:
+            path = overlays / get_dtbo_name(overlay)
+            path.write_bytes(b"dtbo")
+            return path
+
+        patcher = mock.patch.object(create, "get_cached_overlay", compiled)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _create(self, profile: str = "generic") -> tuple[Path, dict]:
+        output = self.tmp / "out" / "bundle.tar"
+        manifest = create.create_bundle(
+            output, PLATFORM, ARCH, profile, self.cache, self.debs, self.downloads
+        )
+        return output, manifest
+
+    def test_layout(self) -> None:
+        output, manifest = self._create()
+        with tarfile.open(output) as tar:
+            names = tar.getnames()
+        self.assertEqual(names[0], MANIFEST)
+        self.assertEqual(set(names[1:]), set(manifest["files"]))
+
+        expected = {
+            *(f"artifacts/{p.name}" for p in self.cache.iterdir()),
+            *(f"overlays/{get_dtbo_name(o)}" for o in OVERLAYS),
+            *(f"udev/{name}" for name in create.UDEV_RULE_FILES),
+            *(f"debs/{url.rsplit('/', 1)[-1]}" for url in create.DOWNLOADS),
+        }
+        self.assertLessEqual(expected, set(names))
+        self.assertLessEqual(set(names) - expected, {MANIFEST, "debs/Packages"})
+
+    def test_manifest(self) -> None:
+        output, manifest = self._create()
+        self.assertEqual(read_manifest(output), manifest)
+        self.assertEqual(manifest["version"], BUNDLE_VERSION)
+        self.assertEqual(manifest["arch"], ARCH)
+        self.assertEqual(manifest["ffmpeg_profile"], "generic")
+        self.assertEqual(Platform.from_dict(manifest["platform"]), PLATFORM)
+        self.assertEqual(set(manifest["artifacts"]), {"mpp", "rga", "ffmpeg"})
+        self.assertEqual(
+            manifest["overlays"], {o.id: get_dtbo_name(o) for o in OVERLAYS}
+        )
+        entry = manifest["files"]["udev/99-led-permissions.rules"]
+        self.assertEqual(
+            entry["size"], len(create.UDEV_RULE_FILES["99-led-permissions.rules"])
+        )
+
+    def test_missing_artifact(self) -> None:
+        with self.assertRaisesRegex(ValueError, "Artifacts missing"):
+            self._create("rk3588-perf")
+        self.assertFalse((self.tmp / "out" / "bundle.tar").exists())
+
+    def test_unknown_profile(self) -> None:
+        with self.assertRaisesRegex(ValueError, "Unknown FFmpeg profile"):
+            self._create("fastest")
+
+
+class BundleSetupDataTest(BundleTestCase):
+    def test_explicit_data_wins(self) -> None:
+        manifest = {"version": BUNDLE_VERSION, "ffmpeg_profile": "size"}
+        path = self.write_tar("b.tar", {MANIFEST: json.dumps(manifest).encode()})
+        run = mock.Mock(return_value=mock.Mock(returncode=0))
+        with mock.patch.object(fleet_setup.subprocess, "run", run):
+            fleet_setup.run_setup(
+                data=["ffmpeg_profile=generic", "build_jobs=2"], bundle=path
+            )
+
+        bundle_cmd, setup_cmd = (call.args[0] for call in run.call_args_list)
+        self.assertIn(f"bundle={path.resolve()}", bundle_cmd)
+        data = [setup_cmd[i + 1] for i, arg in enumerate(setup_cmd) if arg == "--data"]
+        self.assertEqual(
+            data,
+            [
+                "components=stack",
+                *fleet_setup.get_bundle_data(manifest),
+                "ffmpeg_profile=generic",
+                "build_jobs=2",
+            ],
+        )
+        # pyinfra keeps the last value of a repeated --data key
+        profiles = [item for item in data if item.startswith("ffmpeg_profile=")]
+        self.assertEqual(profiles, ["ffmpeg_profile=size", "ffmpeg_profile=generic"])
+
+    def test_failed_unpack_skips_setup(self) -> None:
+        manifest = {"version": BUNDLE_VERSION, "ffmpeg_profile": "size"}
+        path = self.write_tar("b.tar", {MANIFEST: json.dumps(manifest).encode()})
+        run = mock.Mock(return_value=mock.Mock(returncode=1))
+        with mock.patch.object(fleet_setup.subprocess, "run", run):
+            self.assertEqual(fleet_setup.run_setup(bundle=path), 1)
+        self.assertEqual(run.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
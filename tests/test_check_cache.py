@@ -0,0 +1,89 @@
+"""Check result caching of the interactive dashboard."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from videonode_sbc_config.deploys.verify.cache import CheckCache
+from videonode_sbc_config.deploys.verify.types import DEFAULT_TTL, Check
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CheckCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.cache = CheckCache(clock=self.clock)
+        self.calls: dict[str, int] = {}
+
+    def _check(
+        self, name: str, ttl: float = DEFAULT_TTL, depends_on: tuple[str, ...] = ()
+    ) -> Check:
+        # The probe output counts its runs, so cached results are visible
+        def probe() -> str:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            return str(self.calls[name])
+
+        return Check(name=name, probe=probe, ttl=ttl, depends_on=depends_on)
+
+    def _messages(self, *checks: Check) -> list[str]:
+        return [result.message for result in self.cache.run(checks)]
+
+    def test_default_ttl(self) -> None:
+        check = self._check("mpp")
+        self.assertEqual(check.ttl, DEFAULT_TTL)
+        self.assertEqual(self._messages(check), ["1"])
+        self.clock.now += DEFAULT_TTL / 2
+        self.assertEqual(self._messages(check), ["1"])
+        self.clock.now += DEFAULT_TTL / 2
+        self.assertEqual(self._messages(check), ["2"])
+
+    def test_ttl_per_check(self) -> None:
+        fast = self._check("load", ttl=1.0)
+        slow = self._check("disk", ttl=30.0)
+        self.assertEqual(self._messages(fast, slow), ["1", "1"])
+        self.clock.now += 5
+        self.assertEqual(self._messages(fast, slow), ["2", "1"])
+        self.clock.now += 30
+        self.assertEqual(self._messages(fast, slow), ["3", "2"])
+
+    def test_depends_on_mtime(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "armbianEnv.txt")
+            path.write_text("overlays=\n")
+            check = self._check("overlays", ttl=3600.0, depends_on=(str(path),))
+            self.assertEqual(self._messages(check), ["1"])
+            self.assertEqual(self._messages(check), ["1"])
+
+            mtime = path.stat().st_mtime_ns
+            os.utime(path, ns=(mtime, mtime + 1_000_000_000))
+            self.assertEqual(self._messages(check), ["2"])
+
+            path.unlink()
+            self.assertEqual(self._messages(check), ["3"])
+            self.assertEqual(self._messages(check), ["3"])
+
+    def test_invalidate_names(self) -> None:
+        first = self._check("first", ttl=3600.0)
+        second = self._check("second", ttl=3600.0)
+        self.assertEqual(self._messages(first, second), ["1", "1"])
+        self.cache.invalidate(["first", "unknown"])
+        self.assertEqual(self._messages(first, second), ["2", "1"])
+
+    def test_invalidate_all(self) -> None:
+        first = self._check("first", ttl=3600.0)
+        second = self._check("second", ttl=3600.0)
+        self._messages(first, second)
+        self.cache.invalidate()
+        self.assertEqual(self._messages(first, second), ["2", "2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""Platform detection cache validation."""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from videonode_sbc_config.platform import OSType, Platform, SBCFamily, SBCModel, detect
+
+PLATFORM = Platform(
+    OSType.ARMBIAN, SBCFamily.ROCKCHIP, SBCModel.RK3588, board="rock-5b"
+)
+
+
+class DetectCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "platform.json"
+        detect._store_cached(self.path, "boot-1", PLATFORM)
+
+    def _rewrite(self, **changes: object) -> None:
+        data = json.loads(self.path.read_text())
+        data.update(changes)
+        self.path.write_text(json.dumps(data))
+
+    def test_round_trip(self) -> None:
+        self.assertEqual(detect._load_cached(self.path, "boot-1"), PLATFORM)
+
+    def test_other_boot(self) -> None:
+        self.assertIsNone(detect._load_cached(self.path, "boot-2"))
+
+    def test_changed_source(self) -> None:
+        mtimes = {path: 1 for path in detect.TRACKED_SOURCES}
+        with mock.patch.object(detect, "_source_mtimes", return_value=mtimes):
+            self.assertIsNone(detect._load_cached(self.path, "boot-1"))
+
+    def test_other_cache_version(self) -> None:
+        self._rewrite(version=detect.CACHE_VERSION + 1)
+        self.assertIsNone(detect._load_cached(self.path, "boot-1"))
+
+    def test_other_package_version(self) -> None:
+        self._rewrite(package_version="0.0.0")
+        self.assertIsNone(detect._load_cached(self.path, "boot-1"))
+
+    def test_unversioned_entry(self) -> None:
+        data = json.loads(self.path.read_text())
+        del data["version"], data["package_version"]
+        self.path.write_text(json.dumps(data))
+        self.assertIsNone(detect._load_cached(self.path, "boot-1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
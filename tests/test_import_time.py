@@ -0,0 +1,71 @@
+"""Import-time budget of the `status --json` path.
+
+Runs the CLI under `python -X importtime` and checks that the heavy UI and
+deploy packages stay out of it and that the total import time stays small
+compared with the startup of a bare interpreter on the same machine.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import unittest
+
+# Packages only the interactive UI and the deploys need
+FORBIDDEN_PACKAGES = ("rich", "readchar", "pyinfra", "gevent")
+# Budget for the total of all module import times, as a multiple of the
+# imports of `python -c pass`; status --json measured 16x
+IMPORT_BUDGET_FACTOR = 25
+# Absolute budget in milliseconds, replacing the factor when set
+IMPORT_BUDGET_ENV = "VIDEONODE_IMPORT_BUDGET_MS"
+
+
+def _import_times(*args: str) -> dict[str, int]:
+    """Self import time in microseconds per module imported by python args."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        if self_us.strip().isdigit():
+            times[name.strip()] = int(self_us)
+    return times
+
+
+def _import_budget_us() -> int:
+    override = os.environ.get(IMPORT_BUDGET_ENV)
+    if override:
+        return int(float(override) * 1000)
+    bare = statistics.median(
+        sum(_import_times("-c", "pass").values()) for _ in range(3)
+    )
+    return int(bare * IMPORT_BUDGET_FACTOR)
+
+
+class StatusJsonImportTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.times = _import_times("-m", "videonode_sbc_config.cli", "status", "--json")
+        self.assertTrue(self.times, "no -X importtime output")
+
+    def test_no_heavy_packages(self) -> None:
+        imported = {name.split(".")[0] for name in self.times}
+        self.assertEqual(imported & set(FORBIDDEN_PACKAGES), set())
+
+    def test_import_budget(self) -> None:
+        total = sum(self.times.values())
+        budget = _import_budget_us()
+        self.assertLess(
+            total,
+            budget,
+            f"imports took {total / 1000:.0f} ms (budget {budget / 1000:.0f} ms)",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""Overlay cache naming and the armbianEnv.txt user_overlays merge."""
+
+import unittest
+from dataclasses import replace
+
+from videonode_sbc_config.deploys.hardware.rockchip.overlays import OVERLAYS
+from videonode_sbc_config.deploys.os.armbian.kernel_overlays import merge_user_overlays
+from videonode_sbc_config.deploys.overlay_cache import HASH_LENGTH, get_dtbo_name
+
+OVERLAY = OVERLAYS[0]
+
+
+class DtboNameTest(unittest.TestCase):
+    def test_name_format(self) -> None:
+        name = get_dtbo_name(OVERLAY)
+        self.assertRegex(name, rf"^{OVERLAY.id}-[0-9a-f]{{{HASH_LENGTH}}}\.dtbo$")
+
+    def test_keyed_by_source(self) -> None:
+        changed = replace(OVERLAY, dts=OVERLAY.dts + "\n")
+        self.assertNotEqual(get_dtbo_name(changed), get_dtbo_name(OVERLAY))
+
+    def test_metadata_does_not_change_key(self) -> None:
+        renamed = replace(OVERLAY, name="Other name", description="Other text")
+        self.assertEqual(get_dtbo_name(renamed), get_dtbo_name(OVERLAY))
+
+    def test_same_source_other_id(self) -> None:
+        digest = get_dtbo_name(OVERLAY).removeprefix(f"{OVERLAY.id}-")
+        other = replace(OVERLAY, id="other")
+        self.assertEqual(get_dtbo_name(other), f"other-{digest}")
+
+
+class MergeUserOverlaysTest(unittest.TestCase):
+    def test_empty_line(self) -> None:
+        self.assertEqual(
+            merge_user_overlays("user_overlays=", ["usb-host-mode"]),
+            "user_overlays=usb-host-mode",
+        )
+
+    def test_missing_line(self) -> None:
+        self.assertEqual(
+            merge_user_overlays(None, ["usb-host-mode", "disable-hdmirx"]),
+            "user_overlays=usb-host-mode disable-hdmirx",
+        )
+
+    def test_keeps_enabled_overlays_first(self) -> None:
+        self.assertEqual(
+            merge_user_overlays("user_overlays=uart3 i2c1", ["usb-host-mode"]),
+            "user_overlays=uart3 i2c1 usb-host-mode",
+        )
+
+    def test_drops_duplicates(self) -> None:
+        self.assertEqual(
+            merge_user_overlays(
+                "user_overlays=usb-host-mode  uart3 uart3",
+                ["disable-hdmirx", "usb-host-mode", "disable-hdmirx"],
+            ),
+            "user_overlays=usb-host-mode uart3 disable-hdmirx",
+        )
+
+    def test_unchanged_when_enabled(self) -> None:
+        line = "user_overlays=usb-host-mode disable-hdmirx"
+        self.assertEqual(merge_user_overlays(line, ["disable-hdmirx"]), line)
+
+
+if __name__ == "__main__":
+    unittest.main()
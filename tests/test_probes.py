@@ -0,0 +1,120 @@
+"""Verification probes against a fake /sys, /proc and /dev tree."""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from videonode_sbc_config.deploys.verify import probes
+
+MOUNTINFO = """\
+22 1 179:1 / / rw,relatime shared:1 - ext4 /dev/mmcblk0p1 rw
+23 22 0:21 / /proc rw,nosuid shared:2 - proc proc rw
+24 22 179:2 / / rw,relatime shared:3 - ext4 /dev/mmcblk0p2 rw
+25 22 8:1 / /mnt/my\\040disk rw,relatime shared:4 - ext4 /dev/sda1 rw
+26 22 8:2 / /mnt/back\\134slash rw,relatime shared:5 - ext4 /dev/sda2 rw
+"""
+
+
+class FakeTree(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+
+    def write(self, path: str, content: str) -> Path:
+        file = Path(self.root, path.lstrip("/"))
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_text(content)
+        return file
+
+    def link(self, path: str, target: str) -> None:
+        link = Path(self.root, path.lstrip("/"))
+        link.parent.mkdir(parents=True, exist_ok=True)
+        link.symlink_to(target)
+
+
+class SimpleProbesTest(FakeTree):
+    def test_led_trigger(self) -> None:
+        self.write("/sys/class/leds/blue/trigger", "none timer [heartbeat] mmc0\n")
+        self.assertEqual(probes.led_trigger("blue", self.root), "heartbeat")
+
+    def test_led_trigger_without_selection(self) -> None:
+        self.write("/sys/class/leds/blue/trigger", "none timer heartbeat\n")
+        self.assertEqual(probes.led_trigger("blue", self.root), "error")
+        self.assertEqual(probes.led_trigger("green", self.root), "error")
+
+    def test_device_mode(self) -> None:
+        self.write("/dev/mpp_service", "").chmod(0o666)
+        mode = probes.device_mode("/dev/mpp_service", self.root)
+        self.assertEqual(mode, "-rw-rw-rw-")
+        self.assertEqual(probes.device_mode("/dev/rga", self.root), "missing")
+
+    def test_file_installed(self) -> None:
+        self.write("/boot/overlay-user/usb-host-mode.dtbo", "")
+        Path(self.root, "boot/overlay-user/dir.dtbo").mkdir()
+        def installed(name: str) -> str:
+            return probes.file_installed(f"/boot/overlay-user/{name}", self.root)
+
+        self.assertEqual(installed("usb-host-mode.dtbo"), "Installed")
+        self.assertEqual(installed("dir.dtbo"), "Not installed")
+        self.assertEqual(installed("missing.dtbo"), "Not installed")
+
+    def test_fs_usage(self) -> None:
+        usage = probes.fs_usage("/", self.root)
+        self.assertRegex(usage, r"^\d{1,3}%$")
+        self.assertEqual(probes.fs_usage("/missing", self.root), "error")
+
+    @unittest.skipUnless(shutil.which("df"), "df not installed")
+    def test_fs_usage_matches_df(self) -> None:
+        df = subprocess.run(
+            ["df", "--output=pcent", self.root],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(probes.fs_usage("/", self.root), df.stdout.split()[-1])
+
+
+class MountProbesTest(FakeTree):
+    def setUp(self) -> None:
+        super().setUp()
+        self.write("/proc/self/mountinfo", MOUNTINFO)
+        disk = "/sys/devices/platform/fe2c0000.mmc/mmc_host/mmc0/block/mmcblk0"
+        self.write(f"{disk}/size", "122142720\n")
+        self.write(f"{disk}/mmcblk0p2/partition", "2\n")
+        self.write(f"{disk}/mmcblk0p2/size", "61071360\n")
+        target = f"../../{disk.removeprefix('/sys/')}"
+        self.link("/sys/dev/block/179:2", f"{target}/mmcblk0p2")
+        self.link("/sys/class/block/mmcblk0", target)
+        self.link("/sys/class/block/mmcblk0p2", f"{target}/mmcblk0p2")
+
+    def test_mount_device_last_match_wins(self) -> None:
+        self.assertEqual(probes.mount_device("/", self.root), "179:2")
+        self.assertEqual(probes.mount_device("/proc", self.root), "0:21")
+        self.assertIsNone(probes.mount_device("/boot", self.root))
+
+    def test_mount_device_escaped_paths(self) -> None:
+        self.assertEqual(probes.mount_device("/mnt/my disk", self.root), "8:1")
+        self.assertEqual(probes.mount_device("/mnt/back\\slash", self.root), "8:2")
+        self.assertIsNone(probes.mount_device("/mnt/my\\040disk", self.root))
+
+    def test_mount_device_without_mountinfo(self) -> None:
+        os.remove(Path(self.root, "proc/self/mountinfo"))
+        self.assertIsNone(probes.mount_device("/", self.root))
+        self.assertEqual(probes.boot_disk(self.root), "")
+
+    def test_boot_disk(self) -> None:
+        self.assertEqual(probes.block_name("179:2", self.root), "mmcblk0p2")
+        self.assertEqual(probes.boot_disk(self.root), "mmcblk0")
+        self.assertEqual(probes.parent_disk("mmcblk0", self.root), "")
+
+    def test_disk_size(self) -> None:
+        self.assertEqual(probes.disk_size("mmcblk0", self.root), "58.2G")
+        self.assertEqual(probes.disk_size("sda", self.root), "missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""SoC matching on device tree compatible blobs and Armbian BOARD names."""
+
+import unittest
+
+from videonode_sbc_config.platform import SBCFamily, SBCModel
+from videonode_sbc_config.platform.registry import match_sbc
+
+
+def _blob(*tokens: str) -> str:
+    # /proc/device-tree/compatible: NUL-separated and NUL-terminated
+    return "".join(f"{token}\x00" for token in tokens)
+
+
+class MatchSbcTest(unittest.TestCase):
+    def test_rk3588(self) -> None:
+        compatible = _blob("radxa,rock-5b", "rockchip,rk3588")
+        self.assertEqual(match_sbc(compatible), (SBCFamily.ROCKCHIP, SBCModel.RK3588))
+
+    def test_rk3588s_is_not_rk3588(self) -> None:
+        compatible = _blob("xunlong,orangepi-5", "rockchip,rk3588s")
+        self.assertEqual(match_sbc(compatible), (SBCFamily.ROCKCHIP, SBCModel.RK3588S))
+
+    def test_rk3566(self) -> None:
+        compatible = _blob(
+            "xunlong,orangepi-3b-v2.1", "xunlong,orangepi-3b", "rockchip,rk3566"
+        )
+        self.assertEqual(match_sbc(compatible), (SBCFamily.ROCKCHIP, SBCModel.RK3566))
+
+    def test_allwinner(self) -> None:
+        compatible = _blob("xunlong,orangepi-zero3", "allwinner,sun50i-h618")
+        self.assertEqual(match_sbc(compatible), (SBCFamily.ALLWINNER, SBCModel.H618))
+
+    def test_sun_substring_is_not_allwinner(self) -> None:
+        # "samsung" contains "sun", which the old substring match took for Allwinner
+        compatible = _blob(
+            "hardkernel,odroid-xu4", "samsung,exynos5800", "samsung,exynos5"
+        )
+        self.assertEqual(match_sbc(compatible), (SBCFamily.UNKNOWN, SBCModel.UNKNOWN))
+
+    def test_unregistered_soc_keeps_vendor_family(self) -> None:
+        compatible = _blob("pine64,rockpro64-v2.1", "rockchip,rk3399")
+        self.assertEqual(match_sbc(compatible), (SBCFamily.ROCKCHIP, SBCModel.UNKNOWN))
+
+    def test_board_identifies_soc(self) -> None:
+        rk3588 = (SBCFamily.ROCKCHIP, SBCModel.RK3588)
+        self.assertEqual(match_sbc("", "rock-5b"), rk3588)
+        rk3588s = (SBCFamily.ROCKCHIP, SBCModel.RK3588S)
+        self.assertEqual(match_sbc("", "OrangePi5"), rk3588s)
+
+    def test_board_refines_vendor_family(self) -> None:
+        compatible = _blob("radxa,rock-5b", "rockchip,rk35xx")
+        self.assertEqual(
+            match_sbc(compatible, "rock-5b"), (SBCFamily.ROCKCHIP, SBCModel.RK3588)
+        )
+
+    def test_compatible_wins_over_board(self) -> None:
+        compatible = _blob("radxa,zero3", "rockchip,rk3566")
+        self.assertEqual(
+            match_sbc(compatible, "rock-5b"), (SBCFamily.ROCKCHIP, SBCModel.RK3566)
+        )
+
+    def test_board_of_other_family_is_ignored(self) -> None:
+        compatible = _blob("xunlong,orangepi-zero3", "allwinner,sun50i-h6xx")
+        self.assertEqual(
+            match_sbc(compatible, "rock-5b"), (SBCFamily.ALLWINNER, SBCModel.UNKNOWN)
+        )
+
+    def test_unknown_board(self) -> None:
+        compatible = _blob("qemu,virt")
+        self.assertEqual(
+            match_sbc(compatible, "qemu-arm64"), (SBCFamily.UNKNOWN, SBCModel.UNKNOWN)
+        )
+        self.assertEqual(match_sbc(""), (SBCFamily.UNKNOWN, SBCModel.UNKNOWN))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""Deploy helpers that read host data."""
+
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from videonode_sbc_config.deploys import utils
+
+RESOURCES = {"cpus": "8", "mem": str(16 * 1024 * 1024), "quota": "", "load": "0"}
+ALLOY_URL = "https://github.com/grafana/alloy/releases/download/v1.5.0/alloy.zip"
+
+
+def _host(files: tuple[str, ...] = (), **data: object) -> SimpleNamespace:
+    """Stand-in host with --data values and a File fact for files."""
+    return SimpleNamespace(data=data, get_fact=lambda fact, path: path in files)
+
+
+class ParallelJobsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.object(
+            utils, "get_build_resources", return_value=RESOURCES
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _jobs(self, **data: object) -> int:
+        with mock.patch.object(utils, "current_host", _host(**data)):
+            return utils.get_parallel_jobs("mpp")
+
+    def test_override(self) -> None:
+        self.assertEqual(self._jobs(build_jobs="3"), 3)
+        self.assertEqual(self._jobs(build_jobs=12), 12)
+
+    def test_auto(self) -> None:
+        self.assertEqual(self._jobs(), 8)
+        self.assertEqual(self._jobs(build_jobs="auto"), 8)
+
+    def test_invalid_override(self) -> None:
+        for value in ("x4", "0", "-2", "1.5"):
+            with self.subTest(value=value), self.assertRaisesRegex(
+                ValueError, "Invalid build_jobs"
+            ):
+                self._jobs(build_jobs=value)
+
+
+class DownloadUrlTest(unittest.TestCase):
+    def _url(self, host: SimpleNamespace) -> str:
+        with mock.patch.object(utils, "current_host", host):
+            return utils.get_download_url(ALLOY_URL)
+
+    def test_no_mirror(self) -> None:
+        self.assertEqual(self._url(_host()), ALLOY_URL)
+
+    def test_mirror_url(self) -> None:
+        host = _host(download_mirror="http://10.0.0.2/files/")
+        self.assertEqual(self._url(host), "http://10.0.0.2/files/alloy.zip")
+
+    def test_mirror_directory(self) -> None:
+        host = _host(download_mirror="/mnt/files")
+        self.assertEqual(self._url(host), "file:///mnt/files/alloy.zip")
+
+    def test_local_repo_with_file(self) -> None:
+        host = _host(files=("/mnt/debs/alloy.zip",), apt_local_repo="/mnt/debs/")
+        self.assertEqual(self._url(host), "file:///mnt/debs/alloy.zip")
+
+    def test_local_repo_without_file(self) -> None:
+        host = _host(apt_local_repo="/mnt/debs")
+        self.assertEqual(self._url(host), ALLOY_URL)
+
+    def test_mirror_wins_over_local_repo(self) -> None:
+        host = _host(
+            files=("/mnt/debs/alloy.zip",),
+            apt_local_repo="/mnt/debs",
+            download_mirror="http://10.0.0.2",
+        )
+        self.assertEqual(self._url(host), "http://10.0.0.2/alloy.zip")
+
+
+if __name__ == "__main__":
+    unittest.main()